@@ -0,0 +1,719 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Benchmarks - latency/throughput measurements for the search engine
+Usage: python benchmark.py [<benchmark> ...] [--repeat 20]
+
+Benchmarks:
+  index    Cold (no index) vs warm (persisted / in-memory index) query latency per CSV_CONFIG domain
+  batch    Serial search() calls vs one search_many() batch for dozens of page-override lookups
+  tokenize Tokenizing every CSV in data/ and data/stacks/: legacy re.sub vs compiled vs per-corpus cache
+  backend  BM25 scoring throughput (queries/sec), pure-Python vs NumPy, on synthetic 1k/10k/100k-row corpora
+  memory   tracemalloc footprint of all datasets: list of csv.DictReader dicts vs compact Table
+  update   Refreshing a persisted index after appending/editing rows: full rebuild vs incremental update
+  fuzzy    Typo expansion latency vs vocabulary size: trigram side index vs a full difflib scan, plus sample queries
+  domain   detect_domain() per-query cost: legacy per-keyword `in` scan vs keyword automaton vs IDF-weighted
+  quality  Retrieval accuracy per domain, plain BM25 vs BM25F: each row's name/title column as the query
+  jsonl    Throughput of one search.py --jsonl process over 1,000 stdin queries vs one search.py process per query
+  startup  `python -X importtime -c "import search"`: median cumulative import time and its heaviest imports.
+           Regression guard: exits non-zero above --import-budget-ms
+  cache    Result cache: repeated design-system generations and searches with the memo off vs on, hit rate,
+           and reloading a persisted cache
+  designs  Hundreds of design systems: a new DesignSystemGenerator per query vs the shared generate_design_systems()
+  persist  Writing 50 page overrides: persist_design_system() per page vs one batched, thread-pooled pages=[...] call,
+           and a rerun that skips unchanged files
+  render   Formatter time per design system and for 1,000 systems: ascii box, markdown, MASTER.md, page override
+  daemon   p50/p99 latency: cold search.py process vs search.py answered by a --serve daemon vs raw socket request
+"""
+
+import argparse
+import csv
+import difflib
+import itertools
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import core
+import daemon
+from core import BM25, CSV_CONFIG, DATA_DIR, DOMAIN_KEYWORDS, FUZZY_CONFIG, search, search_many
+
+# Measure the search engine itself, not the result memo in front of it (see bench_cache)
+core.RESULT_CACHE_CONFIG["max_entries"] = 0
+
+
+# ============ HELPERS ============
+def _timed(fn, repeat=1):
+    """Run fn `repeat` times, return (mean seconds, last result)"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:9.3f} ms"
+
+
+def _percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered), max(1, math.ceil(pct / 100 * len(ordered)))) - 1]
+
+
+SEARCH_SCRIPT = Path(__file__).parent / "search.py"
+
+
+# ============ BENCHMARKS ============
+def bench_index(repeat):
+    """Cold vs warm query latency across all CSV_CONFIG domains."""
+    query = "modern minimal dashboard accessibility"
+    print("## Index: cold vs warm query latency")
+    print(f"{'domain':<12}{'cold':>14}{'warm (disk)':>16}{'warm (memory)':>16}")
+    totals = [0.0, 0.0, 0.0]
+    # Cold runs delete persisted indexes: use a scratch INDEX_DIR, not the real one
+    scratch = Path(tempfile.mkdtemp(prefix="uipro-bench-"))
+    saved = core.INDEX_DIR
+    core.INDEX_DIR = scratch / ".index"
+    try:
+        for domain in CSV_CONFIG:
+            core.clear_index_cache(persisted=True)
+            cold, _ = _timed(lambda: search(query, domain))
+
+            disk = 0.0
+            for _ in range(repeat):
+                core.clear_index_cache()
+                elapsed, _ = _timed(lambda: search(query, domain))
+                disk += elapsed
+            disk /= repeat
+
+            memory, _ = _timed(lambda: search(query, domain), repeat)
+
+            for i, value in enumerate((cold, disk, memory)):
+                totals[i] += value
+            print(f"{domain:<12}{_ms(cold):>14}{_ms(disk):>16}{_ms(memory):>16}")
+    finally:
+        core.INDEX_DIR = saved
+        core.clear_index_cache()
+        shutil.rmtree(scratch, ignore_errors=True)
+    print(f"{'TOTAL':<12}{_ms(totals[0]):>14}{_ms(totals[1]):>16}{_ms(totals[2]):>16}")
+    print("")
+
+
+def _legacy_tokenize(text):
+    """BM25.tokenize as it was before the compiled tokenizer"""
+    text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+    return [w for w in text.split() if len(w) > 2]
+
+
+def bench_tokenize(repeat):
+    """Time to tokenize every row of every CSV under data/ and data/stacks/."""
+    paths = sorted(DATA_DIR.glob("*.csv")) + sorted(DATA_DIR.glob("stacks/*.csv"))
+    documents = [" ".join(str(value) for value in row) for path in paths for row in core._load_csv(path).rows]
+
+    def compiled(stem=False, stopwords=False, shared=True):
+        cache = {}
+        return [core._tokenize(doc, stem, stopwords, cache if shared else {}) for doc in documents]
+
+    print(f"## Tokenize: {len(paths)} CSVs, {len(documents)} rows")
+    legacy_time, _ = _timed(lambda: [_legacy_tokenize(doc) for doc in documents], repeat)
+    print(f"{'legacy re.sub':<36}{_ms(legacy_time)}")
+    for label, fn in (("compiled", compiled),
+                      ("compiled + stem/stopwords", lambda: compiled(True, True, shared=False)),
+                      ("  ... with per-corpus word cache", lambda: compiled(True, True))):
+        elapsed, _ = _timed(fn, repeat)
+        print(f"{label:<36}{_ms(elapsed)}  ({legacy_time / elapsed:.2f}x)")
+
+    bm25 = BM25()
+    queries = [f"{page} {project}" for project in PROJECTS for page in PAGES]
+    core._tokenize_query.cache_clear()
+    cold, _ = _timed(lambda: [bm25.tokenize(q) for q in queries])
+    warm, _ = _timed(lambda: [bm25.tokenize(q) for q in queries], repeat)
+    print(f"{len(queries)} queries: LRU cold {_ms(cold)} / warm {_ms(warm)}")
+    print("")
+
+
+def _synthetic_corpus(rows, rng, vocab_size=20000):
+    """Zipf-like synthetic documents of 10-40 tokens each"""
+    vocab = [f"term{i:05d}" for i in range(vocab_size)]
+    cum_weights = list(itertools.accumulate(1.0 / (i + 1) for i in range(vocab_size)))
+    documents = [" ".join(rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(10, 40))) for _ in range(rows)]
+    return documents, vocab, cum_weights
+
+
+def bench_backend(repeat):
+    """Queries/sec of the pure-Python postings loop vs the NumPy sparse backend."""
+    print("## Backend: BM25 scoring throughput (top-3, 3-term queries)")
+    if core._numpy() is None:
+        print("NumPy not installed - only the pure-Python backend is available")
+    print(f"{'rows':>8}{'python q/s':>14}{'numpy q/s':>14}{'speedup':>10}")
+    rng = random.Random(42)
+    for rows in (1000, 10000, 100000):
+        documents, vocab, cum_weights = _synthetic_corpus(rows, rng)
+        queries = [" ".join(rng.choices(vocab, cum_weights=cum_weights, k=3)) for _ in range(max(repeat, 1) * 10)]
+
+        python_bm25 = BM25(backend="python")
+        python_bm25.fit(documents)
+        elapsed, _ = _timed(lambda: [python_bm25.score(q, top_k=3) for q in queries])
+        python_qps = len(queries) / elapsed
+
+        numpy_qps = None
+        if core._numpy() is not None:
+            numpy_bm25 = BM25.from_dict(python_bm25.to_dict(), backend="numpy")
+            elapsed, _ = _timed(lambda: [numpy_bm25.score(q, top_k=3) for q in queries])
+            numpy_qps = len(queries) / elapsed
+
+        numpy_col = f"{numpy_qps:14.0f}" if numpy_qps else f"{'n/a':>14}"
+        speedup = f"{numpy_qps / python_qps:9.1f}x" if numpy_qps else f"{'n/a':>10}"
+        print(f"{rows:>8}{python_qps:14.0f}{numpy_col}{speedup}")
+    print("")
+
+
+PAGES = ["dashboard", "checkout", "settings", "landing", "login", "pricing", "blog", "product",
+         "search", "404", "profile", "analytics"]
+PROJECTS = ["saas analytics", "e-commerce luxury", "beauty spa wellness", "fintech crypto"]
+
+
+def bench_batch(repeat):
+    """Per-page override searches issued serially vs batched through search_many()."""
+    batch = []
+    for project in PROJECTS:
+        for page in PAGES:
+            context = f"{page} {project}"
+            batch.extend([(context, "style", 1), (context, "ux", 3), (context, "landing", 1)])
+
+    search_many(batch)  # Warm the indexes so both sides measure only query work
+    serial, _ = _timed(lambda: [search(q, d, n) for q, d, n in batch], repeat)
+    batched, _ = _timed(lambda: search_many(batch), repeat)
+    threaded, _ = _timed(lambda: search_many(batch, max_workers=4), repeat)
+
+    print(f"## Batch: {len(batch)} searches for {len(PROJECTS) * len(PAGES)} page overrides")
+    print(f"{'serial search()':<28}{_ms(serial)}")
+    print(f"{'search_many()':<28}{_ms(batched)}  ({serial / batched:.1f}x)")
+    print(f"{'search_many(max_workers=4)':<28}{_ms(threaded)}  ({serial / threaded:.1f}x)")
+    print("")
+
+
+def _traced(fn):
+    """(bytes still allocated after fn, peak bytes) while keeping fn's result alive"""
+    tracemalloc.start()
+    result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def bench_memory(repeat):
+    """Memory held by every CSV_CONFIG / STACK_CONFIG dataset, dict rows vs Table."""
+    paths = [DATA_DIR / config["file"] for config in list(CSV_CONFIG.values()) + list(core.STACK_CONFIG.values())]
+
+    def dict_rows():
+        tables = []
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                tables.append(list(csv.DictReader(f)))
+        return tables
+
+    def compact_rows():
+        return [core._load_csv(path) for path in paths]
+
+    print(f"## Memory: {len(paths)} datasets loaded")
+    print(f"{'store':<24}{'retained':>14}{'peak':>14}")
+    baseline = None
+    for label, fn in (("list of dicts", dict_rows), ("Table (tuples, interned)", compact_rows)):
+        current, peak = _traced(fn)
+        baseline = baseline or current
+        print(f"{label:<24}{current / 1024:11.1f} KB{peak / 1024:11.1f} KB  ({current / baseline:.0%})")
+    print("")
+
+
+def bench_update(repeat):
+    """Index refresh after a CSV edit, full rebuild vs incremental update, on a scratch copy of data/."""
+    scratch = Path(tempfile.mkdtemp(prefix="uipro-bench-"))
+    shutil.copytree(DATA_DIR, scratch / "data")
+    sources = [("style", scratch / "data" / CSV_CONFIG["style"]["file"], CSV_CONFIG["style"])]
+    sources += [(stack, scratch / "data" / config["file"], core._STACK_COLS) for stack, config in core.STACK_CONFIG.items()]
+    # x100 copies of style (BM25F, always refitted) and the first stack (plain BM25)
+    for name, path, config in [sources[0], sources[1]]:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            header, *rows = list(csv.reader(f))
+        large = path.with_name(f"{path.stem}-x100.csv")
+        with open(large, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows([header] + rows * 100)
+        sources.append((f"{name} x100", large, config))
+
+    def rewrite(path, rows):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(rows)
+
+    print("## Update: refreshing an index after a CSV change")
+    print(f"{'csv':<20}{'change':<12}{'full rebuild':>16}{'incr. (disk)':>16}{'incr. (memory)':>16}")
+    saved = core.INDEX_DIR
+    core.INDEX_DIR = scratch / ".index"
+    runs = max(repeat // 5, 1)
+    try:
+        for name, path, config in sources:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                original = list(csv.reader(f))
+            edited = [row[:] for row in original]
+            edited[len(edited) // 2][1] += " edited"
+            changes = (("append 1", original + original[1:2]), ("append 10", original + original[1:11]),
+                       ("edit 1", edited))
+            index = lambda: core._get_index(path, config["search_cols"], config.get("weights"))
+            for label, rows in changes:
+                totals = [0.0, 0.0, 0.0]
+                for _ in range(runs):
+                    for i, clear in enumerate(("all", "memory", None)):
+                        rewrite(path, original)
+                        core.clear_index_cache(persisted=True)
+                        index()
+                        rewrite(path, rows)
+                        if clear:
+                            core.clear_index_cache(persisted=clear == "all")
+                        elapsed, _ = _timed(index)
+                        totals[i] += elapsed
+                print(f"{name:<20}{label:<12}" + "".join(f"{_ms(total / runs):>16}" for total in totals))
+            rewrite(path, original)
+    finally:
+        core.INDEX_DIR = saved
+        core.clear_index_cache()
+        shutil.rmtree(scratch, ignore_errors=True)
+    print("")
+
+
+def _typo(word, rng):
+    """word with one random deletion, insertion, substitution or transposition"""
+    i = rng.randrange(len(word) - 1)
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return rng.choice([word[:i] + word[i + 1:], word[:i] + letter + word[i:], word[:i] + letter + word[i + 1:],
+                       word[:i] + word[i + 1] + word[i] + word[i + 2:]])
+
+
+def bench_fuzzy(repeat):
+    """Per-token expansion latency and recall over synthetic vocabularies of 1k-100k words."""
+    rng = random.Random(7)
+    # Word-shaped vocabularies: a character bigram chain trained on the real CSV vocabulary
+    real = {word for path in sorted(DATA_DIR.glob("*.csv")) for row in core._load_csv(path).rows
+            for value in row if value for word in core._tokenize(value) if word.isalpha()}
+    chain = {}
+    for word in real:
+        for a, b in zip("^" + word, word + "$"):
+            chain.setdefault(a, []).append(b)
+
+    def make_word():
+        word, letter = "", "^"
+        while len(word) < 16:
+            letter = rng.choice(chain[letter])
+            if letter == "$":
+                break
+            word += letter
+        return word
+
+    print("## Fuzzy: expansion of one misspelled token (cold - expansion cache cleared)")
+    print(f"{'vocab':>8}{'index build':>14}{'trigram p50':>14}{'trigram p99':>14}{'recall':>8}{'difflib scan':>16}")
+    for size in (1000, 10000, 100000):
+        words = set()
+        while len(words) < size:
+            word = make_word()
+            if len(word) >= FUZZY_CONFIG["min_length"]:
+                words.add(word)
+        bm25 = BM25(backend="python")
+        bm25.fit(sorted(words))
+        vocab = list(bm25.idf)
+        targets = rng.sample(vocab, 200)
+        typos = [(target, _typo(target, rng)) for target in targets]
+        typos = [(target, typo) for target, typo in typos if typo not in bm25.idf]
+
+        build, _ = _timed(bm25._build_grams)
+        times = []
+        hits = 0
+        for target, typo in typos:
+            bm25._expansions.clear()
+            start = time.perf_counter()
+            expansion = bm25.expand(typo)
+            times.append(time.perf_counter() - start)
+            hits += target in expansion
+        scan, _ = _timed(lambda: [difflib.get_close_matches(typo, vocab, 2, 0.7) for _, typo in typos[:5]])
+        print(f"{len(vocab):>8}{_ms(build):>14}{_ms(_percentile(times, 50)):>14}{_ms(_percentile(times, 99)):>14}"
+              f"{hits / len(typos):>8.0%}{_ms(scan / 5):>16}")
+
+    print("")
+    for query in ("glassmorphsm", "neumorphism dashbord", "acessibility typograpy"):
+        FUZZY_CONFIG["enabled"] = False
+        try:
+            before = search(query, "style")
+        finally:
+            FUZZY_CONFIG["enabled"] = True
+        after = search(query, "style")
+        print(f"{query!r:<26} exact: {before['count']} results | fuzzy: "
+              + ", ".join(row["Style Category"] for row in after["results"]))
+    print("")
+
+
+def _legacy_detect_domain(query):
+    """detect_domain as it was before the keyword automaton"""
+    query_lower = query.lower()
+    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in DOMAIN_KEYWORDS.items()}
+    best = max(scores, key=scores.get)
+    return best if scores[best] > 0 else "style"
+
+
+def bench_domain(repeat):
+    """Per-query detect_domain() latency over the page-override contexts plus random keyword soups."""
+    rng = random.Random(11)
+    keywords = [kw for kws in DOMAIN_KEYWORDS.values() for kw in kws]
+    queries = [f"{page} {project}" for project in PROJECTS for page in PAGES]
+    queries += [" ".join(rng.choices(keywords + PAGES, k=rng.randint(2, 8))) for _ in range(200)]
+    core.detect_domain(queries[0], idf_weighted=True)  # Build the automaton and keyword weights
+
+    print(f"## Domain: detect_domain() over {len(queries)} queries")
+    legacy, _ = _timed(lambda: [_legacy_detect_domain(q) for q in queries], repeat)
+    print(f"{'legacy `kw in query` scan':<28}{_ms(legacy / len(queries))}/query")
+    for label, weighted in (("keyword automaton", False), ("automaton + IDF weights", True)):
+        elapsed, detected = _timed(lambda: [core.detect_domain(q, idf_weighted=weighted) for q in queries], repeat)
+        agree = sum(a == _legacy_detect_domain(q) for a, q in zip(detected, queries)) / len(queries)
+        print(f"{label:<28}{_ms(elapsed / len(queries))}/query  ({legacy / elapsed:.1f}x, {agree:.0%} same domain as legacy)")
+    print("")
+
+
+def bench_quality(repeat):
+    """Top-1 / top-3 self-retrieval accuracy and query latency, BM25 vs BM25F, per domain."""
+    print("## Quality: query = a row's name column (highest weight), hit = that row ranked in top-1 / top-3")
+    print(f"{'domain':<12}{'rows':>6}{'BM25 @1':>10}{'@3':>7}{'BM25F @1':>10}{'@3':>7}{'BM25 q':>14}{'BM25F q':>14}")
+    for domain, config in CSV_CONFIG.items():
+        path = DATA_DIR / config["file"]
+        if not path.exists() or not config.get("weights"):
+            continue
+        cols = config["search_cols"]
+        query_col = max(cols, key=lambda col: config["weights"].get(col, 1.0))
+        _, plain = core._build_index([(None, path)], cols)
+        data, fielded = core._build_index([(None, path)], cols, weights=config["weights"])
+        queries = [(idx, str(data.get(idx, query_col))) for idx in range(len(data)) if data.get(idx, query_col)]
+
+        row = f"{domain:<12}{len(queries):>6}"
+        timings = []
+        for bm25 in (plain, fielded):
+            top1 = top3 = 0
+            for idx, query in queries:
+                ranked = [i for i, _ in bm25.score(query, top_k=3)]
+                top1 += bool(ranked) and ranked[0] == idx
+                top3 += idx in ranked
+            elapsed, _ = _timed(lambda: [bm25.score(q, top_k=3) for _, q in queries], max(repeat // 10, 1))
+            timings.append(elapsed / max(len(queries), 1))
+            row += f"{top1 / len(queries):>10.0%}{top3 / len(queries):>7.0%}"
+        print(row + f"{_ms(timings[0]):>14}{_ms(timings[1]):>14}")
+    print("")
+
+
+def bench_jsonl(repeat):
+    """Bulk lookups: one streaming --jsonl process vs a CLI process per query."""
+    base = [f"{page} {project}" for project in PROJECTS for page in PAGES]
+    queries = (base * (1000 // len(base) + 1))[:1000]
+    payload = "\n".join(queries) + "\n"
+
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, str(SEARCH_SCRIPT), "--jsonl"], input=payload, text=True,
+                          capture_output=True, check=True)
+    stream = time.perf_counter() - start
+    records = done.stdout.count("\n")
+
+    sample = base[:max(min(repeat, len(base)), 2)]
+    start = time.perf_counter()
+    for query in sample:
+        subprocess.run([sys.executable, str(SEARCH_SCRIPT), query, "--json", "--no-daemon"],
+                       stdout=subprocess.DEVNULL, check=True)
+    per_process = (time.perf_counter() - start) / len(sample)
+
+    print(f"## JSONL: {len(queries)} queries")
+    print(f"{'--jsonl stream':<28}{stream:9.3f} s  ({records / stream:,.0f} queries/s, {records} records)")
+    print(f"{'one process per query':<28}{per_process * len(queries):9.3f} s  (estimated from {len(sample)} runs)")
+    print("")
+
+
+IMPORT_BUDGET_MS = 40.0
+
+
+def _import_times(module):
+    """[(name, self us, cumulative us, depth)] in `python -X importtime -c "import <module>"` order"""
+    done = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=SEARCH_SCRIPT.parent, capture_output=True, text=True, check=True)
+    times = []
+    for line in done.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[0].startswith("import time:") or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times.append((name.strip(), int(parts[0].split(":")[1]), int(parts[1]), depth))
+    return times
+
+
+def bench_startup(repeat, budget_ms=None):
+    """Import cost of search.py; returns False when it exceeds the budget."""
+    import compileall
+    compileall.compile_dir(str(SEARCH_SCRIPT.parent), quiet=1)  # Measure imports, not byte-compilation
+
+    budget_ms = IMPORT_BUDGET_MS if budget_ms is None else budget_ms
+    runs = [_import_times("search") for _ in range(max(repeat // 2, 3))]
+    totals = sorted(next(cumulative for name, _, cumulative, depth in run if name == "search" and depth == 0)
+                    for run in runs)
+    total = totals[len(totals) // 2] / 1000
+    print(f"## Startup: `import search` over {len(runs)} runs")
+    print(f"{'median cumulative':<28}{total:9.3f} ms  (budget {budget_ms:.0f} ms)")
+
+    # importtime lists a module after everything it imported: search's direct imports
+    # are the depth-1 lines between the previous top-level line and its own
+    last = runs[-1]
+    end = next(i for i, (name, _, _, depth) in enumerate(last) if name == "search" and depth == 0)
+    start = max([i for i in range(end) if last[i][3] == 0], default=-1) + 1
+    direct = sorted(((cumulative, name) for name, _, cumulative, depth in last[start:end] if depth == 1), reverse=True)
+    for cumulative, name in direct[:6]:
+        print(f"  {name:<26}{cumulative / 1000:9.3f} ms")
+    loaded = {name for name, _, _, _ in last}
+    for module in ("core", "design_system", "concurrent.futures", "hashlib", "tempfile", "socket"):
+        print(f"  {module + ' loaded':<26}{'yes' if module in loaded else 'no':>9}")
+    ok = total <= budget_ms
+    print("OK" if ok else f"FAIL: import time {total:.1f} ms exceeds {budget_ms:.0f} ms")
+    print("")
+    return ok
+
+
+def bench_cache(repeat):
+    """A session repeating the same lookups: result cache off vs on."""
+    import design_system
+
+    def session():
+        for project in PROJECTS:
+            design_system.DesignSystemGenerator().generate(project)
+            for page in PAGES:
+                search(f"{page} {project}")
+                core.search_stack(page, "react")
+
+    def run(max_entries, path=None):
+        saved = dict(core.RESULT_CACHE_CONFIG)
+        core.RESULT_CACHE_CONFIG["max_entries"] = max_entries
+        core._RESULT_CACHE = core.ResultCache(max_entries, core.RESULT_CACHE_CONFIG["ttl"], path)
+        try:
+            session()  # Warm indexes (and, when enabled, the cache)
+            elapsed, _ = _timed(session, repeat)
+            return elapsed, core.result_cache_stats()
+        finally:
+            core.RESULT_CACHE_CONFIG.update(saved)
+
+    print("## Cache: one session = 4 design systems + 48 searches + 48 stack searches")
+    off, _ = run(0)
+    on, stats = run(4096)
+    print(f"{'result cache off':<28}{_ms(off)}/session")
+    print(f"{'result cache on':<28}{_ms(on)}/session  ({off / on:.1f}x, hit rate {stats['hit_rate']:.0%}, "
+          f"{stats['entries']} entries)")
+
+    path = Path(tempfile.mkdtemp(prefix="uipro-bench-")) / "results.json"
+    core._RESULT_CACHE = core.ResultCache(4096, None, path)
+    session()
+    core._RESULT_CACHE.save()
+    core.clear_index_cache()
+    reloaded = core.ResultCache(4096, None, path)
+    core._RESULT_CACHE = reloaded
+    elapsed, _ = _timed(session)
+    print(f"{'fresh process, persisted':<28}{_ms(elapsed)}/session  (hit rate {reloaded.stats()['hit_rate']:.0%}, "
+          f"{path.stat().st_size / 1024:.0f} KB on disk)")
+    core._RESULT_CACHE = None
+    shutil.rmtree(path.parent, ignore_errors=True)
+    print("")
+
+
+def bench_designs(repeat):
+    """Design systems for hundreds of sites: a fresh generator per query vs generate_design_systems()."""
+    import design_system
+
+    with open(DATA_DIR / "products.csv", 'r', encoding='utf-8') as f:
+        product_types = [row["Product Type"] for row in csv.DictReader(f)]
+    queries = [f"{product} {page}" for product in product_types for page in ("landing", "dashboard")]
+    repeat = max(1, repeat // 10)
+
+    def fresh():
+        for query in queries:
+            design_system.format_ascii_box(design_system.DesignSystemGenerator().generate(query))
+
+    design_system.generate_design_systems(queries)  # Warm indexes for both sides
+    per_call, _ = _timed(fresh, repeat)
+    shared, _ = _timed(lambda: design_system.generate_design_systems(queries), repeat)
+    load, _ = _timed(design_system.DesignSystemGenerator, 20)
+
+    print(f"## Designs: {len(queries)} design systems ({len(product_types)} product types x 2 pages)")
+    print(f"{'new generator per query':<28}{_ms(per_call)}  ({per_call / len(queries) * 1000:.3f} ms/system)")
+    print(f"{'generate_design_systems()':<28}{_ms(shared)}  ({shared / len(queries) * 1000:.3f} ms/system, "
+          f"{per_call / shared:.1f}x)")
+    print(f"{'reasoning load':<28}{_ms(load)}")
+    print("")
+
+
+def bench_persist(repeat):
+    """50 page overrides: persist per page vs one pages=[...] call, then a rerun over unchanged inputs."""
+    import design_system
+
+    query = "saas analytics"
+    pages = [f"{page} {variant}" for variant in ("", "v2", "mobile", "admin", "beta") for page in PAGES][:50]
+    pages = [page.strip() for page in pages]
+    ds = design_system.get_generator().generate(query, "Bench")
+    out = tempfile.mkdtemp(prefix="uipro-bench-")
+    manifest = Path(out) / "design-system" / "bench" / design_system.MANIFEST_FILE
+    repeat = max(1, repeat // 5)
+
+    def persist(*args, **kwargs):
+        manifest.unlink(missing_ok=True)  # Force every file to be written
+        return design_system.persist_design_system(ds, *args, **kwargs)
+
+    persist(None, out, query, pages=pages)  # Warm indexes
+    per_page, _ = _timed(lambda: [persist(page, out, query) for page in pages], repeat)
+    serial, result = _timed(lambda: persist(None, out, query, pages=pages), repeat)
+    pooled, _ = _timed(lambda: persist(None, out, query, pages=pages, max_workers=8), repeat)
+    rerun, skipped = _timed(lambda: design_system.persist_design_system(ds, None, out, query, pages=pages), repeat)
+    shutil.rmtree(out, ignore_errors=True)
+
+    print(f"## Persist: MASTER.md + {len(result['created_files']) - 1} page overrides")
+    print(f"{'persist per page':<28}{_ms(per_page)}")
+    print(f"{'pages=[...], 1 worker':<28}{_ms(serial)}  ({per_page / serial:.1f}x)")
+    print(f"{'pages=[...], 8 workers':<28}{_ms(pooled)}  ({per_page / pooled:.1f}x)")
+    print(f"{'rerun, unchanged inputs':<28}{_ms(rerun)}  ({serial / rerun:.1f}x, "
+          f"{skipped['skipped']}/{len(skipped['created_files'])} files skipped)")
+    print("")
+
+
+def bench_render(repeat):
+    """Formatter cost per design system (ascii / markdown / MASTER.md / page override) and for 1,000 systems."""
+    import design_system
+
+    with open(DATA_DIR / "products.csv", 'r', encoding='utf-8') as f:
+        product_types = [row["Product Type"] for row in csv.DictReader(f)]
+    variants = ("", "dashboard", "landing page", "mobile app", "dark mode", "minimal", "luxury", "playful",
+                "enterprise", "startup", "portfolio")
+    queries = [f"{product} {variant}".strip() for variant in variants for product in product_types][:1000]
+    generator = design_system.get_generator()
+    systems = [generator.generate(query) for query in queries]
+    overrides = design_system._generate_intelligent_overrides("dashboard", "analytics", systems[0])
+    formatters = [
+        ("format_ascii_box", design_system.format_ascii_box),
+        ("format_markdown", design_system.format_markdown),
+        ("format_master_md", design_system.format_master_md),
+        ("format_page_override_md", lambda ds: design_system.format_page_override_md(ds, "dashboard", None, overrides)),
+    ]
+    repeat = max(1, repeat // 10)
+
+    print(f"## Render: {len(systems)} design systems")
+    print(f"{'formatter':<28}{'per system':>14}{'1,000 systems':>16}")
+    total = 0.0
+    for name, fn in formatters:
+        fn(systems[0])  # Compile the template outside the timing
+        elapsed, _ = _timed(lambda: [fn(ds) for ds in systems], repeat)
+        total += elapsed
+        print(f"{name:<28}{elapsed / len(systems) * 1e6:11.1f} us{_ms(elapsed * 1000 / len(systems)):>16}")
+    print(f"{'all four':<28}{total / len(systems) * 1e6:11.1f} us{_ms(total * 1000 / len(systems)):>16}")
+    print("")
+
+
+def bench_daemon(repeat):
+    """Latency percentiles for one CLI query with and without the search daemon."""
+    scratch = Path(tempfile.mkdtemp(prefix="uipro-bench-"))
+    socket_path = str(scratch / "search.sock")
+    # Cold runs delete persisted indexes, so the CLI runs from a copy of scripts/ and data/, whose
+    # INDEX_DIR is scratch/.index; core.INDEX_DIR points there too for clear_index_cache()
+    shutil.copytree(SEARCH_SCRIPT.parent, scratch / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+    shutil.copytree(DATA_DIR, scratch / "data")
+    script = scratch / "scripts" / SEARCH_SCRIPT.name
+    queries = [f"{page} {project}" for project in PROJECTS for page in PAGES]
+    runs = max(repeat, 2)
+
+    def cli(query, *extra):
+        subprocess.run([sys.executable, str(script), query, "--socket", socket_path, *extra],
+                       stdout=subprocess.DEVNULL, check=True)
+
+    def cold_cli(query):
+        core.clear_index_cache(persisted=True)
+        cli(query, "--no-daemon")
+
+    def sample(fn):
+        times = []
+        for i in range(runs):
+            start = time.perf_counter()
+            fn(queries[i % len(queries)])
+            times.append(time.perf_counter() - start)
+        return times
+
+    saved = core.INDEX_DIR
+    core.INDEX_DIR = scratch / ".index"
+    try:
+        results = {"cold CLI (no index on disk)": sample(cold_cli)}
+        results["CLI, persisted index"] = sample(lambda q: cli(q, "--no-daemon"))
+
+        server = subprocess.Popen([sys.executable, str(script), "--serve", "--socket", socket_path],
+                                  stdout=subprocess.PIPE)
+        try:
+            server.stdout.readline()  # Ready banner
+            results["CLI via daemon"] = sample(cli)
+            with daemon.Client(socket_path) as client:
+                results["socket request (connected)"] = sample(lambda q: client.request({"op": "search", "query": q}))
+        finally:
+            server.terminate()
+            server.wait()
+    finally:
+        core.INDEX_DIR = saved
+        core.clear_index_cache()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    print(f"## Daemon: per-query latency over {runs} runs")
+    print(f"{'mode':<30}{'p50':>14}{'p99':>14}")
+    for label, times in results.items():
+        print(f"{label:<30}{_ms(_percentile(times, 50)):>14}{_ms(_percentile(times, 99)):>14}")
+    print("")
+
+
+BENCHMARKS = {
+    "index": bench_index,
+    "batch": bench_batch,
+    "tokenize": bench_tokenize,
+    "backend": bench_backend,
+    "memory": bench_memory,
+    "update": bench_update,
+    "fuzzy": bench_fuzzy,
+    "domain": bench_domain,
+    "quality": bench_quality,
+    "jsonl": bench_jsonl,
+    "cache": bench_cache,
+    "designs": bench_designs,
+    "persist": bench_persist,
+    "render": bench_render,
+    "startup": bench_startup,
+    "daemon": bench_daemon,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UI Pro Max Benchmarks")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark", help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--repeat", "-r", type=int, default=20, help="Repetitions per measurement (default: 20)")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"startup: fail when importing search.py takes longer (default: {IMPORT_BUDGET_MS:.0f})")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    failed = False
+    for name in args.benchmarks or BENCHMARKS:
+        if name == "startup":
+            failed |= not bench_startup(args.repeat, args.import_budget_ms)
+        else:
+            BENCHMARKS[name](args.repeat)
+    sys.exit(1 if failed else 0)
@@ -5,235 +5,1190 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import heapq
+import json
+import os
 import re
+import threading
+import time
 from pathlib import Path
-from math import log
-from collections import defaultdict
+from math import ceil, log
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+
+# Datasets and MAX_RESULTS live in catalog.py (no imports) so search.py can
+# parse its arguments and ask the daemon without loading this module
+from catalog import AVAILABLE_STACKS, CSV_CONFIG, MAX_RESULTS, STACK_CONFIG
+
+# hashlib, tempfile and concurrent.futures are imported where used: they are
+# only needed to (re)build persisted indexes or fan out search_many(), and
+# importing them costs every search.py process several milliseconds
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
-MAX_RESULTS = 3
-
-CSV_CONFIG = {
-    "style": {
-        "file": "styles.csv",
-        "search_cols": ["Style Category", "Keywords", "Best For", "Type"],
-        "output_cols": ["Style Category", "Type", "Keywords", "Primary Colors", "Effects & Animation", "Best For", "Performance", "Accessibility", "Framework Compatibility", "Complexity"]
-    },
-    "prompt": {
-        "file": "prompts.csv",
-        "search_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords"],
-        "output_cols": ["Style Category", "AI Prompt Keywords (Copy-Paste Ready)", "CSS/Technical Keywords", "Implementation Checklist"]
-    },
-    "color": {
-        "file": "colors.csv",
-        "search_cols": ["Product Type", "Keywords", "Notes"],
-        "output_cols": ["Product Type", "Keywords", "Primary (Hex)", "Secondary (Hex)", "CTA (Hex)", "Background (Hex)", "Text (Hex)", "Border (Hex)", "Notes"]
-    },
-    "chart": {
-        "file": "charts.csv",
-        "search_cols": ["Data Type", "Keywords", "Best Chart Type", "Accessibility Notes"],
-        "output_cols": ["Data Type", "Keywords", "Best Chart Type", "Secondary Options", "Color Guidance", "Accessibility Notes", "Library Recommendation", "Interactive Level"]
-    },
-    "landing": {
-        "file": "landing.csv",
-        "search_cols": ["Pattern Name", "Keywords", "Conversion Optimization", "Section Order"],
-        "output_cols": ["Pattern Name", "Keywords", "Section Order", "Primary CTA Placement", "Color Strategy", "Conversion Optimization"]
-    },
-    "product": {
-        "file": "products.csv",
-        "search_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Key Considerations"],
-        "output_cols": ["Product Type", "Keywords", "Primary Style Recommendation", "Secondary Styles", "Landing Page Pattern", "Dashboard Style (if applicable)", "Color Palette Focus"]
-    },
-    "ux": {
-        "file": "ux-guidelines.csv",
-        "search_cols": ["Category", "Issue", "Description", "Platform"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "typography": {
-        "file": "typography.csv",
-        "search_cols": ["Font Pairing Name", "Category", "Mood/Style Keywords", "Best For", "Heading Font", "Body Font"],
-        "output_cols": ["Font Pairing Name", "Category", "Heading Font", "Body Font", "Mood/Style Keywords", "Best For", "Google Fonts URL", "CSS Import", "Tailwind Config", "Notes"]
-    },
-    "icons": {
-        "file": "icons.csv",
-        "search_cols": ["Category", "Icon Name", "Keywords", "Best For"],
-        "output_cols": ["Category", "Icon Name", "Keywords", "Library", "Import Code", "Usage", "Best For", "Style"]
-    },
-    "react": {
-        "file": "react-performance.csv",
-        "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    },
-    "web": {
-        "file": "web-interface.csv",
-        "search_cols": ["Category", "Issue", "Keywords", "Description"],
-        "output_cols": ["Category", "Issue", "Platform", "Description", "Do", "Don't", "Code Example Good", "Code Example Bad", "Severity"]
-    }
+INDEX_DIR = Path(__file__).parent.parent / ".index"
+INDEX_VERSION = 8
+NUMPY_MIN_DOCS = 1000  # "auto" backend switches to NumPy at this corpus size
+INCREMENTAL_MAX_CHANGE = 0.5  # Refit indexes from scratch when more rows than this changed
+INCREMENTAL_MIN_ROWS = 2000  # ...or, for a persisted index, when it has fewer rows: loading it costs more than a refit
+QUERY_TOKEN_CACHE_SIZE = 4096
+
+# Applied identically at index and query time; changing it rebuilds persisted indexes
+TOKENIZER_CONFIG = {
+    "stem": False,       # Light suffix stripping (plurals, -ing, -ed)
+    "stopwords": False   # Drop STOP_WORDS
+}
+
+# Memo of search()/search_stack() results, keyed on query tokens, domain,
+# max_results, the CSV's mtime/size and its catalog columns (see ResultCache)
+RESULT_CACHE_CONFIG = {
+    "max_entries": 4096,  # LRU bound; 0 disables the cache
+    "ttl": 3600,          # Seconds an entry stays valid; None = until evicted or the CSV changes
+    "persist": False      # Also keep entries across processes in INDEX_DIR/results.json
 }
 
-STACK_CONFIG = {
-    "html-tailwind": {"file": "stacks/html-tailwind.csv"},
-    "react": {"file": "stacks/react.csv"},
-    "nextjs": {"file": "stacks/nextjs.csv"},
-    "vue": {"file": "stacks/vue.csv"},
-    "nuxtjs": {"file": "stacks/nuxtjs.csv"},
-    "nuxt-ui": {"file": "stacks/nuxt-ui.csv"},
-    "svelte": {"file": "stacks/svelte.csv"},
-    "swiftui": {"file": "stacks/swiftui.csv"},
-    "react-native": {"file": "stacks/react-native.csv"},
-    "flutter": {"file": "stacks/flutter.csv"},
-    "shadcn": {"file": "stacks/shadcn.csv"},
-    "jetpack-compose": {"file": "stacks/jetpack-compose.csv"}
+# Typo tolerance: a query token missing from an index's vocabulary is replaced
+# by its nearest vocabulary terms by character-trigram (Dice) similarity
+FUZZY_CONFIG = {
+    "enabled": True,
+    "min_length": 4,          # Shorter unknown tokens are left as they are
+    "min_similarity": 0.7,
+    "max_expansions": 2
 }
 
+STOP_WORDS = frozenset([
+    "and", "are", "but", "can", "for", "from", "has", "have", "into", "its", "not", "off", "only",
+    "that", "the", "their", "them", "then", "there", "these", "they", "this", "use", "used", "using",
+    "was", "were", "what", "when", "where", "which", "while", "who", "will", "with", "you", "your"
+])
+
+# Domain auto-detection (detect_domain): a domain scores when its keywords occur in the query
+DOMAIN_KEYWORDS = {
+    "color": ["color", "palette", "hex", "#", "rgb"],
+    "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
+    "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
+    "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
+    "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
+    "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
+    "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
+    "typography": ["font", "typography", "heading", "serif", "sans"],
+    "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
+    "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
+    "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
+}
+DOMAIN_IDF_WEIGHTING = False  # Weigh keywords by rarity across the domain indexes instead of counting hits
+
 # Common columns for all stacks
 _STACK_COLS = {
     "search_cols": ["Category", "Guideline", "Description", "Do", "Don't"],
+    "weights": {"Category": 1.5, "Guideline": 3.0, "Description": 1.0, "Do": 1.0, "Don't": 1.0},
     "output_cols": ["Category", "Guideline", "Description", "Do", "Don't", "Code Good", "Code Bad", "Severity", "Docs URL"]
 }
 
-AVAILABLE_STACKS = list(STACK_CONFIG.keys())
+# Column added to rows of the combined cross-stack index
+STACK_LABEL_COL = "Stack"
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    NumPy for the vectorized BM25 backend, imported on first use (it costs
+    more than the rest of startup combined); None when not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+# ============ TOKENIZER ============
+# Runs of 3+ word characters == punctuation -> space, split, drop words of <= 2 chars
+_TOKEN_RE = re.compile(r'\w{3,}')
+
+
+def _stem(word):
+    """Light English suffix stripping; never shortens below 3 characters"""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+            return word[:-len(suffix)]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def _tokenize(text, stem=False, stopwords=False, cache=None):
+    """
+    Lowercase, split, remove punctuation, filter short words, then
+    optionally drop stop words and stem. `cache` (word -> term, "" for a
+    dropped word) can be shared across a corpus so each distinct word is
+    normalized once.
+    """
+    tokens = _TOKEN_RE.findall(str(text).lower())
+    if not (stem or stopwords):
+        return tokens
+    if cache is None:
+        cache = {}
+    terms = []
+    for word in tokens:
+        term = cache.get(word)
+        if term is None:
+            term = "" if stopwords and word in STOP_WORDS else word
+            if term and stem:
+                term = _stem(term)
+            cache[word] = term
+        if term:
+            terms.append(term)
+    return terms
+
+
+def _trigrams(term):
+    """Distinct character trigrams of a term, padded with ^/$ word boundaries"""
+    padded = f"^{term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@lru_cache(maxsize=QUERY_TOKEN_CACHE_SIZE)
+def _tokenize_query(text, stem=False, stopwords=False):
+    """LRU-cached _tokenize() for query strings"""
+    return tuple(_tokenize(text, stem, stopwords))
 
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """
+    BM25 ranking algorithm for text search
+
+    backend: "python" scores through postings dicts, "numpy" through a
+    sparse term x doc matrix, "auto" picks NumPy for corpora of at least
+    NUMPY_MIN_DOCS documents. Without NumPy installed, always "python".
 
-    def __init__(self, k1=1.5, b=0.75):
+    field_weights switches to BM25F (see fit_fields()).
+    """
+
+    def __init__(self, k1=1.5, b=0.75, backend="auto", stem=None, stopwords=None, field_weights=None):
         self.k1 = k1
         self.b = b
-        self.corpus = []
+        self.backend = backend
+        self.stem = TOKENIZER_CONFIG["stem"] if stem is None else stem
+        self.stopwords = TOKENIZER_CONFIG["stopwords"] if stopwords is None else stopwords
+        self.field_weights = list(field_weights) if field_weights else None
+        self.field_avglens = []
+        self.field_totals = []
         self.doc_lengths = []
+        self.doc_norms = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}
         self.N = 0
+        self._matrix = None
+        self._grams = None
+        self._expansions = {}
 
     def tokenize(self, text):
-        """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        """Tokenize a query (LRU-cached) with this index's tokenizer settings"""
+        return list(_tokenize_query(str(text), self.stem, self.stopwords))
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 index (postings: term -> [(doc_id, tf)]) from documents"""
+        word_cache = {}
+        self.fit_tokens([_tokenize(doc, self.stem, self.stopwords, word_cache) for doc in documents])
+
+    def fit_tokens(self, corpus):
+        """fit() for documents that are already tokenized"""
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
+        postings = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            term_freqs = defaultdict(int)
             for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
+        self._fit_postings(postings)
 
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+    def fit_fields(self, documents):
+        """
+        Build a BM25F index from documents given as per-field texts, aligned
+        with field_weights.
+
+        Each field's term frequency is normalized against that field's own
+        average length and weighted, and the sum is stored in the postings
+        at index time:
+            tf~ = sum_f w_f * tf_f / (1 - b + b * len_f / avglen_f)
+            score = idf * tf~ * (k1 + 1) / (tf~ + k1)
+        so a query costs exactly what a plain BM25 query does.
+        """
+        corpus = self._doc_tokens(documents, {})
+        self.N = len(corpus)
+        if self.N == 0:
+            return
+        self.field_totals = [sum(len(doc[f]) for doc in corpus) for f in range(len(self.field_weights))]
+        self.field_avglens = [total / self.N or 1 for total in self.field_totals]
+        self.doc_lengths = [sum(len(tokens) for tokens in doc) for doc in corpus]
+        self.avgdl = sum(self.doc_lengths) / self.N
+
+        postings = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            for word, tf in self._term_freqs(doc).items():
+                postings[word].append((idx, tf))
+        self._fit_postings(postings)
 
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+    def _doc_tokens(self, documents, word_cache):
+        """Tokenize documents into per-field token lists (a single field without field_weights)"""
+        if self.field_weights:
+            return [[_tokenize(text, self.stem, self.stopwords, word_cache) for text in doc] for doc in documents]
+        return [[_tokenize(doc, self.stem, self.stopwords, word_cache)] for doc in documents]
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
+    def _term_freqs(self, fields):
+        """term -> tf of one tokenized document; the weighted, normalized tf~ for BM25F"""
+        if not self.field_weights:
             term_freqs = defaultdict(int)
-            for word in doc:
+            for word in fields[0]:
                 term_freqs[word] += 1
+            return term_freqs
+        term_freqs = defaultdict(float)
+        for tokens, field_weight, avglen in zip(fields, self.field_weights, self.field_avglens):
+            if not tokens:
+                continue
+            weight = field_weight / (1 - self.b + self.b * len(tokens) / avglen)
+            for word in tokens:
+                term_freqs[word] += weight
+        return term_freqs
+
+    def splice(self, start, stop, old_documents, new_documents):
+        """
+        Replace documents [start, stop) with new_documents, like list slice
+        assignment, without refitting the rest of the corpus.
+
+        old_documents are the replaced documents' previous texts: only their
+        terms' postings and the new documents' are rewritten (every posting
+        list is renumbered when the document count changes). doc_freqs, idf
+        and avgdl are updated in place.
+
+        Every stored BM25F tf~ depends on the field average lengths, so a
+        change that moves any of them would need every posting recomputed;
+        returns False, leaving the index untouched, in that case or when
+        the corpus would be emptied - refit instead. The result is always
+        identical to a fresh fit.
+        """
+        word_cache = {}
+        old = self._doc_tokens(old_documents, word_cache)
+        new = self._doc_tokens(new_documents, word_cache)
+        n = self.N - len(old) + len(new)
+        if n <= 0 or len(old) != stop - start:
+            return False
+        if self.field_weights:
+            field_totals = [total - sum(len(doc[f]) for doc in old) + sum(len(doc[f]) for doc in new)
+                            for f, total in enumerate(self.field_totals)]
+            if [total / n or 1 for total in field_totals] != self.field_avglens:
+                return False
+            self.field_totals = field_totals
+
+        additions = defaultdict(list)
+        for offset, doc in enumerate(new):
+            for word, tf in self._term_freqs(doc).items():
+                additions[word].append((start + offset, tf))
+        touched = set(additions)
+        for doc in old:
+            for tokens in doc:
+                touched.update(tokens)
+
+        shift = len(new) - len(old)
+        # Documents after the spliced range are renumbered, which touches every posting list
+        for word in self.postings.keys() | touched if shift and stop < self.N else touched:
+            docs = [(idx + shift if idx >= stop else idx, tf)
+                    for idx, tf in self.postings.get(word, ()) if not start <= idx < stop]
+            if word in additions:
+                docs.extend(additions[word])
+                docs.sort()
+            if docs:
+                self.postings[word] = docs
+                self.doc_freqs[word] = len(docs)
+            else:
+                self.postings.pop(word, None)
+                self.doc_freqs.pop(word, None)
+                self.idf.pop(word, None)
+
+        self.doc_lengths[start:stop] = [sum(len(tokens) for tokens in doc) for doc in new]
+        self.avgdl = sum(self.doc_lengths) / n
+        # IDF depends on N, so a changed document count refreshes every term
+        for word in self.postings if n != self.N else touched & self.postings.keys():
+            freq = self.doc_freqs[word]
+            self.idf[word] = log((n - freq + 0.5) / (freq + 0.5) + 1)
+        self.N = n
+        self._finalize()
+        return True
+
+    def _fit_postings(self, postings):
+        """Derive document frequencies, IDF and scoring state from fresh postings"""
+        self.postings = dict(postings)
+
+        for word, docs in self.postings.items():
+            self.doc_freqs[word] = len(docs)
+
+        for word, freq in self.doc_freqs.items():
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+
+        self._finalize()
+
+    def _use_numpy(self):
+        if self.backend == "python" or (self.backend != "numpy" and self.N < NUMPY_MIN_DOCS):
+            return False
+        return _numpy() is not None
+
+    def _finalize(self):
+        """Precompute per-doc length normalization; the NumPy matrix is rebuilt on the next query"""
+        if self.field_weights:
+            # BM25F postings are already length-normalized per field
+            self.doc_norms = [self.k1] * len(self.doc_lengths)
+        else:
+            # A corpus without a single token has avgdl 0 (and every dl 0)
+            avgdl = self.avgdl or 1
+            self.doc_norms = [self.k1 * (1 - self.b + self.b * dl / avgdl) for dl in self.doc_lengths]
+        self._matrix = None
+        self._grams = None
+        self._expansions = {}
+
+    def _build_matrix(self):
+        """Sparse term x doc matrix for the NumPy backend"""
+        np = _numpy()
+        # CSR layout with one row per term: row t spans doc_ids/tfs[indptr[t]:indptr[t + 1]]
+        term_ids = {}
+        indptr = [0]
+        doc_ids = []
+        tfs = []
+        for word, docs in self.postings.items():
+            term_ids[word] = len(term_ids)
+            doc_ids.extend(idx for idx, _ in docs)
+            tfs.extend(tf for _, tf in docs)
+            indptr.append(len(doc_ids))
+        self._matrix = {
+            "term_ids": term_ids,
+            "indptr": np.asarray(indptr, dtype=np.int64),
+            "doc_ids": np.asarray(doc_ids, dtype=np.int64),
+            "tfs": np.asarray(tfs, dtype=np.float64),
+            "idf": np.asarray([self.idf[word] for word in term_ids], dtype=np.float64),
+            "norms": np.asarray(self.doc_norms, dtype=np.float64)
+        }
+        return self._matrix
+
+    def _score_numpy(self, tokens, top_k):
+        """Vectorized scoring: gather the query terms' rows, then one weighted bincount"""
+        if top_k is not None and top_k <= 0:
+            return []  # As heapq.nlargest; argpartition can't select zero or fewer
+        np = _numpy()
+        m = self._matrix or self._build_matrix()
+        rows = [m["term_ids"][t] for t in tokens if t in m["term_ids"]]
+        if not rows:
+            return []
+        indptr = m["indptr"]
+        gather = np.concatenate([np.arange(indptr[r], indptr[r + 1]) for r in rows])
+        row_idf = np.repeat(m["idf"][rows], indptr[np.add(rows, 1)] - indptr[rows])
+        doc_ids = m["doc_ids"][gather]
+        tfs = m["tfs"][gather]
+        weights = row_idf * (tfs * (self.k1 + 1)) / (tfs + m["norms"][doc_ids])
+        scores = np.bincount(doc_ids, weights=weights, minlength=self.N)
+
+        hits = np.flatnonzero(scores)
+        if top_k is not None and len(hits) > top_k:
+            hits = hits[np.argpartition(-scores[hits], top_k - 1)[:top_k]]
+            # Widen to every doc tied with the k-th score so tie order stays stable
+            kth = scores[hits].min()
+            hits = np.flatnonzero(scores >= kth)
+        order = np.lexsort((hits, -scores[hits]))
+        ranked = [(int(idx), float(scores[idx])) for idx in hits[order]]
+        return ranked if top_k is None else ranked[:top_k]
+
+    def _build_grams(self):
+        """Trigram -> vocabulary terms containing it, plus each term's trigram count"""
+        grams = defaultdict(list)
+        sizes = {}
+        for term in self.idf:
+            term_grams = _trigrams(term)
+            sizes[term] = len(term_grams)
+            for gram in term_grams:
+                grams[gram].append(term)
+        self._grams = (dict(grams), sizes)
+        return self._grams
+
+    def expand(self, token):
+        """
+        Vocabulary terms to look up for a query token: the token itself when
+        indexed, else its nearest terms (FUZZY_CONFIG). Candidates come from
+        the trigram side index, so only terms sharing one of the token's
+        rarest trigrams are compared - never the whole vocabulary.
+        """
+        if token in self.idf or len(token) < FUZZY_CONFIG["min_length"]:
+            return (token,)
+        expansion = self._expansions.get(token)
+        if expansion is not None:
+            return expansion
+
+        index, sizes = self._grams or self._build_grams()
+        token_grams = _trigrams(token)
+        n = len(token_grams)
+        min_similarity = FUZZY_CONFIG["min_similarity"]
+        # Dice >= s bounds a match's trigram count and the overlap it needs; a term
+        # sharing `overlap` of the token's n trigrams must contain one of its
+        # n - overlap + 1 rarest, so only those posting lists are read
+        min_size = ceil(n * min_similarity / (2 - min_similarity) - 1e-9)
+        max_size = n * (2 - min_similarity) / min_similarity + 1e-9
+        overlap = ceil(min_similarity * (n + min_size) / 2 - 1e-9)
+        rarest = sorted(token_grams, key=lambda gram: len(index.get(gram, ())))[:n - overlap + 1]
+        candidates = []
+        for term in {term for gram in rarest for term in index.get(gram, ())}:
+            if min_size <= sizes[term] <= max_size:
+                similarity = 2 * len(token_grams & _trigrams(term)) / (n + sizes[term])
+                if similarity >= min_similarity:
+                    candidates.append((similarity, term))
+        best = heapq.nlargest(FUZZY_CONFIG["max_expansions"], candidates)
+        expansion = tuple(term for _, term in best) or (token,)
+
+        if len(self._expansions) >= QUERY_TOKEN_CACHE_SIZE:
+            self._expansions.clear()
+        self._expansions[token] = expansion
+        return expansion
+
+    def score(self, query, top_k=None):
+        """
+        Score documents containing at least one query term, best first.
+
+        Only the postings of query terms are visited; documents without any
+        query term score 0 and are omitted. With top_k, a heap selects the
+        best k instead of sorting every hit.
+        """
+        return self.score_tokens(self.tokenize(query), top_k)
+
+    def score_tokens(self, tokens, top_k=None, fuzzy=None):
+        """score() for an already tokenized query; fuzzy (default FUZZY_CONFIG) expands unknown tokens"""
+        if FUZZY_CONFIG["enabled"] if fuzzy is None else fuzzy:
+            tokens = [term for token in tokens for term in self.expand(token)]
+        if self.N and self._use_numpy():
+            return self._score_numpy(tokens, top_k)
+
+        scores = defaultdict(float)
+        for token in tokens:
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for idx, tf in self.postings[token]:
+                numerator = tf * (self.k1 + 1)
+                denominator = tf + self.doc_norms[idx]
+                scores[idx] += idf * numerator / denominator
+
+        # Ties keep corpus order, like a stable sort by score
+        key = lambda x: (x[1], -x[0])
+        if top_k is None:
+            return sorted(scores.items(), key=key, reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=key)
+
+    def copy(self):
+        """Independent copy for splice(); posting lists are shared since splice() replaces them"""
+        bm25 = BM25(self.k1, self.b, self.backend, self.stem, self.stopwords, self.field_weights)
+        bm25.field_avglens = list(self.field_avglens)
+        bm25.field_totals = list(self.field_totals)
+        bm25.doc_lengths = list(self.doc_lengths)
+        bm25.doc_norms = self.doc_norms
+        bm25.avgdl = self.avgdl
+        bm25.idf = dict(self.idf)
+        bm25.doc_freqs = defaultdict(int, self.doc_freqs)
+        bm25.postings = dict(self.postings)
+        bm25.N = self.N
+        return bm25
+
+    def to_dict(self):
+        """Serialize fitted index state"""
+        return {
+            "k1": self.k1,
+            "b": self.b,
+            "stem": self.stem,
+            "stopwords": self.stopwords,
+            "field_weights": self.field_weights,
+            "field_avglens": self.field_avglens,
+            "field_totals": self.field_totals,
+            "doc_lengths": self.doc_lengths,
+            "avgdl": self.avgdl,
+            "idf": self.idf,
+            "postings": self.postings,
+            "N": self.N
+        }
+
+    @classmethod
+    def from_dict(cls, state, backend="auto"):
+        """Restore a fitted index from to_dict() output"""
+        bm25 = cls(state["k1"], state["b"], backend, state["stem"], state["stopwords"], state["field_weights"])
+        bm25.field_avglens = state["field_avglens"]
+        bm25.field_totals = state["field_totals"]
+        bm25.doc_lengths = state["doc_lengths"]
+        bm25.avgdl = state["avgdl"]
+        bm25.idf = state["idf"]
+        bm25.postings = {word: [tuple(p) for p in docs] for word, docs in state["postings"].items()}
+        bm25.doc_freqs = defaultdict(int, {word: len(docs) for word, docs in bm25.postings.items()})
+        bm25.N = state["N"]
+        bm25._finalize()
+        return bm25
+
+
+# ============ COMPACT ROW STORE ============
+class Table:
+    """
+    Compact in-memory CSV: one shared column schema and a tuple per row.
+
+    Repeated values (categories, severities, platforms...) are interned
+    per table so each distinct string is stored once. Short CSV rows keep
+    None for their missing cells, like csv.DictReader; extra cells beyond
+    the header are dropped.
+    """
+
+    __slots__ = ("columns", "rows", "_positions")
+
+    def __init__(self, columns, rows):
+        self.columns = tuple(columns)
+        self.rows = rows
+        self._positions = {col: i for i, col in enumerate(self.columns)}
+
+    @classmethod
+    def from_records(cls, columns, records):
+        """Build from iterables of cell values, interning repeated values"""
+        pool = {}
+        width = len(columns)
+        rows = []
+        for record in records:
+            record = list(record)[:width]
+            record.extend([None] * (width - len(record)))
+            rows.append(tuple(value if value is None else pool.setdefault(value, value) for value in record))
+        return cls(columns, rows)
+
+    @classmethod
+    def concat(cls, labelled_tables, label_col):
+        """Stack tables into one, adding label_col with each source table's label"""
+        columns = []
+        for _, table in labelled_tables:
+            columns.extend(col for col in table.columns if col not in columns)
+        columns.append(label_col)
+        records = []
+        for label, table in labelled_tables:
+            positions = [table._positions.get(col) for col in columns[:-1]]
+            records.extend([row[pos] if pos is not None else None for pos in positions] + [label] for row in table.rows)
+        return cls.from_records(columns, records)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, col):
+        return col in self._positions
+
+    def get(self, idx, col, default=""):
+        """Value of one cell, default when the column doesn't exist"""
+        pos = self._positions.get(col)
+        return default if pos is None else self.rows[idx][pos]
+
+    def project(self, idx, cols):
+        """Row idx as a dict restricted to cols that exist in the schema"""
+        row = self.rows[idx]
+        positions = self._positions
+        return {col: row[positions[col]] for col in cols if col in positions}
+
+    def to_dict(self):
+        return {"columns": list(self.columns), "rows": self.rows}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls.from_records(state["columns"], state["rows"])
+
+
+# ============ DOMAIN DETECTION ============
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over a fixed keyword set: find() reports every
+    keyword occurring in a text - overlapping and nested ones included,
+    exactly like testing `kw in text` for each - in one pass over the text.
+
+    The failure links are folded into a full transition table, so each
+    character costs a single dict lookup.
+    """
+
+    def __init__(self, keywords):
+        goto = [{}]
+        outputs = [set()]
+        for kw in keywords:
+            state = 0
+            for ch in kw:
+                if ch not in goto[state]:
+                    goto.append({})
+                    outputs.append(set())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            outputs[state].add(kw)
+
+        # Breadth-first: a state's failure target is always finished before the state itself
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                delta[state][ch] = nxt
+                queue.append(nxt)
+        self._delta = delta
+        self._outputs = [frozenset(out) for out in outputs]
+
+    def find(self, text):
+        """Set of keywords occurring in text"""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+@lru_cache(maxsize=1)
+def _domain_matcher():
+    """(automaton over every DOMAIN_KEYWORDS keyword, keyword -> positions of its domains)"""
+    keyword_domains = defaultdict(list)
+    for pos, keywords in enumerate(DOMAIN_KEYWORDS.values()):
+        for kw in keywords:
+            keyword_domains[kw].append(pos)
+    return KeywordAutomaton(keyword_domains), dict(keyword_domains)
+
+
+_KEYWORD_WEIGHTS = {}
+
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
+def _domain_keyword_weights():
+    """
+    keyword -> log(1 + D / df), df being how many of the D domain indexes
+    have all of the keyword's terms in their vocabulary - at least 1 for
+    keywords no index contains, D for ones the tokenizer drops ("ui",
+    "#"...), which are mostly substring noise ("ux" in "luxury").
+    Recomputed when a domain CSV changes.
+    """
+    key = []
+    for config in CSV_CONFIG.values():
+        try:
+            stat = os.stat(os.path.join(DATA_DIR, config["file"]))
+        except OSError:
+            continue
+        key.append((config["file"], stat.st_mtime_ns, stat.st_size))
+    if _KEYWORD_WEIGHTS.get("key") != key:
+        paths = [DATA_DIR / config["file"] for config in CSV_CONFIG.values()]
+        indexes = [_get_index(path, config["search_cols"], config.get("weights"))[1]
+                   for path, config in zip(paths, CSV_CONFIG.values()) if path.exists()]
+        weights = {}
+        for kw in _domain_matcher()[1]:
+            terms = _tokenize(kw)
+            df = sum(1 for bm25 in indexes if all(term in bm25.idf for term in terms)) if terms else len(indexes)
+            weights[kw] = log(1 + len(indexes) / max(df, 1))
+        _KEYWORD_WEIGHTS.update(key=key, weights=weights)
+    return _KEYWORD_WEIGHTS["weights"]
 
-            scores.append((idx, score))
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+# ============ RESULT CACHE ============
+def _tupled(value):
+    """JSON lists back to the tuples cache keys are made of"""
+    return tuple(_tupled(v) for v in value) if isinstance(value, list) else value
+
+
+class ResultCache:
+    """
+    LRU memo with an optional per-entry TTL and optional JSON persistence.
+
+    Thread-safe (search_many() may run domains on a thread pool). Keys are
+    tuples of str/int/tuples; values must be JSON-serializable when
+    persisting. Persisted entries are loaded on first use and written back
+    at exit when anything changed.
+    """
+
+    def __init__(self, max_entries=1024, ttl=None, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires at, wall clock, or None, value)
+        self._lock = threading.Lock()
+        self._loaded = path is None
+        self._dirty = False
+
+    def get(self, key):
+        """Cached value or None; counts a hit or a miss"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl if self.ttl else None, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            self._dirty = True
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+            self._dirty = self.path is not None
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "entries": len(self._entries), "evictions": self.evictions}
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get("version") != INDEX_VERSION:
+            return
+        now = time.time()
+        for key, expires, value in state.get("entries", [])[-self.max_entries:]:
+            if expires is None or expires >= now:
+                self._entries[_tupled(key)] = (expires, value)
+
+    def save(self):
+        """Persist entries (no-op without a path or when nothing changed)"""
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            entries = [[key, expires, value] for key, (expires, value) in self._entries.items()]
+            self._dirty = False
+        _write_index(self.path, {"version": INDEX_VERSION, "entries": entries})
+
+
+_RESULT_CACHE = None
+
+
+def _result_cache():
+    """The process-wide ResultCache, created from RESULT_CACHE_CONFIG on first use"""
+    global _RESULT_CACHE
+    if _RESULT_CACHE is None:
+        persist = RESULT_CACHE_CONFIG["persist"]
+        _RESULT_CACHE = ResultCache(RESULT_CACHE_CONFIG["max_entries"], RESULT_CACHE_CONFIG["ttl"],
+                                    INDEX_DIR / "results.json" if persist else None)
+        if persist:
+            import atexit
+            atexit.register(_RESULT_CACHE.save)
+    return _RESULT_CACHE
+
+
+def result_cache_stats():
+    """Hit/miss counters of the search result cache"""
+    return _result_cache().stats()
+
+
+def clear_result_cache():
+    _result_cache().clear()
+
+
+def _cached_results(kind, name, filepath, config, query, max_results, compute):
+    """
+    compute() -> results, memoized on (kind, name, query tokens, max_results,
+    CSV mtime/size, the CSV's search_cols/output_cols/weights from config,
+    tokenizer/fuzzy settings). Callers get their own copies of the result
+    rows. Returns None when filepath doesn't exist.
+    """
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    cache = _result_cache()
+    if cache.max_entries <= 0:
+        return compute()
+    tokens = _tokenize_query(str(query), TOKENIZER_CONFIG["stem"], TOKENIZER_CONFIG["stopwords"])
+    settings = tuple(sorted(TOKENIZER_CONFIG.items())) + tuple(sorted(FUZZY_CONFIG.items()))
+    # A catalog edit (columns, weights) changes the results as surely as a CSV edit
+    columns = (tuple(config["search_cols"]), tuple(config["output_cols"]),
+               tuple(sorted((config.get("weights") or {}).items())))
+    key = (kind, name, tokens, max_results, (stat.st_mtime_ns, stat.st_size), columns, settings)
+    results = cache.get(key)
+    if results is None:
+        results = compute()
+        cache.put(key, results)
+    return [dict(row) for row in results]
 
 
 # ============ SEARCH FUNCTIONS ============
 def _load_csv(filepath):
-    """Load CSV and return list of dicts"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+    """Load CSV into a compact Table"""
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = next(reader, [])
+        return Table.from_records(columns, reader)
 
 
-def _search_csv(filepath, search_cols, output_cols, query, max_results):
-    """Core search function using BM25"""
-    if not filepath.exists():
-        return []
+# In-process cache: (sources, search_cols, label_col, tokenizer) -> (fingerprint, table, bm25)
+_INDEX_CACHE = {}
+
+
+def _file_digest(filepath):
+    """SHA-1 of file contents, used when mtime alone can't prove freshness"""
+    import hashlib
+    with open(filepath, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _index_path(name, key_parts):
+    """Location of a persisted index; key_parts (sources, columns, tokenizer) pick the file"""
+    import hashlib
+    digest = hashlib.sha1("\0".join(key_parts).encode('utf-8')).hexdigest()[:12]
+    return INDEX_DIR / f"{name}-{digest}.json"
+
+
+def _read_index(path, header=None):
+    """
+    Load a persisted index's header line (version, sources, columns), or
+    None if missing/unreadable - enough to tell whether it is fresh without
+    parsing the table and BM25 state. Passing a header read earlier loads
+    those too, from the second line, provided the file still starts with
+    that header.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.loads(f.readline())
+            if state.get("version") != INDEX_VERSION or (header is not None and state != header):
+                return None
+            if header is not None:
+                state.update(json.loads(f.readline()))
+    except (OSError, ValueError):
+        return None
+    return state
+
+
+def _write_index(path, state, body=None):
+    """
+    Atomically persist an index - state, then body on a second line (see
+    _read_index()); failures (read-only installs) are ignored.
+    """
+    import tempfile
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            # dumps() takes the C encoder's one-shot path; dump() streams through the pure-Python one
+            f.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+            if body is not None:
+                f.write("\n" + json.dumps(body, ensure_ascii=False, separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _load_sources(sources, label_col=None):
+    """Parse CSV(s) into one Table; label_col tags each row with its source label"""
+    if label_col:
+        return Table.concat([(label, _load_csv(filepath)) for label, filepath in sources], label_col)
+    return _load_csv(sources[0][1])
+
+
+def _index_documents(data, search_cols, weighted, start=0, stop=None):
+    """What BM25 indexes for rows [start, stop): per-column texts for BM25F, else one joined text"""
+    rows = range(start, len(data) if stop is None else stop)
+    if weighted:
+        return [[str(data.get(idx, col)) for col in search_cols] for idx in rows]
+    return [" ".join(str(data.get(idx, col)) for col in search_cols) for idx in rows]
+
+
+def _build_index(sources, search_cols, label_col=None, weights=None):
+    """
+    Parse CSV(s) and fit BM25 over their search columns; label_col tags
+    each row with its source label. weights ({column: weight}, missing
+    columns weigh 1.0) selects BM25F.
+    """
+    data = _load_sources(sources, label_col)
+    if weights:
+        bm25 = BM25(field_weights=[weights.get(col, 1.0) for col in search_cols])
+        bm25.fit_fields(_index_documents(data, search_cols, True))
+    else:
+        bm25 = BM25()
+        bm25.fit(_index_documents(data, search_cols, False))
+    return data, bm25
+
+
+def _update_index(old_data, bm25, sources, search_cols, label_col=None):
+    """
+    Bring a stale index (old_data, bm25) up to date, re-tokenizing only what
+    changed; bm25 is updated in place, so pass a private copy.
+
+    The re-parsed rows are compared with the rows the index was built from;
+    the span between their common prefix and common suffix (appended,
+    edited, inserted or deleted rows) is spliced into the BM25 state.
+    Returns (table, bm25), or None when a full rebuild is needed: a changed
+    header, more than INCREMENTAL_MAX_CHANGE of the rows changed, or a
+    moved BM25F field average length (see BM25.splice()).
+    """
+    data = _load_sources(sources, label_col)
+    if data.columns != old_data.columns:
+        return None
+    old_rows, rows = old_data.rows, data.rows
+    limit = min(len(old_rows), len(rows))
+    prefix = 0
+    while prefix < limit and old_rows[prefix] == rows[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_rows[-1 - suffix] == rows[-1 - suffix]:
+        suffix += 1
+    old_stop, stop = len(old_rows) - suffix, len(rows) - suffix
+    if (old_stop - prefix) + (stop - prefix) > INCREMENTAL_MAX_CHANGE * len(rows):
+        return None
+
+    weighted = bool(bm25.field_weights)
+    if not bm25.splice(prefix, old_stop, _index_documents(old_data, search_cols, weighted, prefix, old_stop),
+                       _index_documents(data, search_cols, weighted, prefix, stop)):
+        return None
+    return data, bm25
+
 
-    data = _load_csv(filepath)
+def _get_index(filepath, search_cols, weights=None):
+    """Return (table, bm25) for one CSV - see _get_corpus_index()"""
+    return _get_corpus_index([(None, filepath)], search_cols, weights=weights)
 
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
 
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
+def _get_corpus_index(sources, search_cols, label_col=None, weights=None):
+    """
+    Return (table, bm25) for the CSVs in sources [(label, filepath), ...],
+    fitted as one corpus and built at most once.
 
-    # Get top results with score > 0
+    Indexes are cached in memory and persisted under INDEX_DIR, keyed by
+    each CSV's mtime/size and falling back to a content hash, so repeated
+    queries - within a process or across processes - only pay for scoring.
+    When a CSV changes, a plain BM25 index - the in-memory one, or else a
+    persisted one of at least INCREMENTAL_MIN_ROWS rows - is updated
+    incrementally (see _update_index()) rather than rebuilt.
+    """
+    search_cols = tuple(search_cols)
+    weights = {col: weights[col] for col in search_cols if col in weights} if weights else {}
+    stats = [filepath.stat() for _, filepath in sources]
+    fingerprint = tuple((stat.st_mtime_ns, stat.st_size) for stat in stats)
+    tokenizer = dict(TOKENIZER_CONFIG)
+    cache_key = (tuple((label, str(filepath)) for label, filepath in sources), search_cols, label_col,
+                 tuple(sorted(weights.items())), tuple(sorted(tokenizer.items())))
+
+    cached = _INDEX_CACHE.get(cache_key)
+    if cached and cached[0] == fingerprint:
+        return cached[1], cached[2]
+
+    names = [f"{label}={filepath.name}" for label, filepath in sources]
+    name = sources[0][1].stem if len(sources) == 1 else f"{sources[0][1].parent.name}-combined"
+    path = _index_path(name, names + list(search_cols) + [f"label={label_col}"] +
+                       [f"weight:{k}={v}" for k, v in sorted(weights.items())] +
+                       [f"{k}={v}" for k, v in sorted(tokenizer.items())])
+    state = None if cached else _read_index(path)
+    stored = state.get("sources", []) if state else []
+    compatible = (state is not None and list(search_cols) == state.get("search_cols")
+                  and weights == state.get("weights") and tokenizer == state.get("tokenizer")
+                  and [(source.get("label"), source.get("file")) for source in stored]
+                  == [(label, filepath.name) for label, filepath in sources])
+    fresh = compatible and all(source.get("size") == stat.st_size for source, stat in zip(stored, stats))
+    touched = False
+    for source, (_, filepath), stat in zip(stored, sources, stats):
+        if not fresh:
+            break
+        if source.get("mtime_ns") != stat.st_mtime_ns:
+            # Touched but possibly unchanged (e.g. git checkout) - compare contents
+            fresh = source.get("sha1") == _file_digest(filepath)
+            touched = True
+    # Only the header has been parsed so far: a stale index is loaded only if it will be spliced.
+    # BM25F indexes are always refitted - nearly any edit moves a field average, which splice() refuses.
+    incremental = (compatible and not fresh and not weights
+                   and state.get("rows", 0) >= INCREMENTAL_MIN_ROWS)
+    if fresh or incremental:
+        header = state
+        state = _read_index(path, header)
+        fresh = fresh and state is not None
+        incremental = incremental and state is not None
+    if fresh and touched:
+        for source, stat in zip(header["sources"], stats):
+            source["mtime_ns"] = stat.st_mtime_ns
+        _write_index(path, header, {"table": state["table"], "bm25": state["bm25"]})
+
+    if fresh:
+        data, bm25 = Table.from_dict(state["table"]), BM25.from_dict(state["bm25"])
+    else:
+        updated = None
+        if cached and not weights:
+            # A long-running process (e.g. the daemon) saw a CSV change: update a copy of its index
+            updated = _update_index(cached[1], cached[2].copy(), sources, search_cols, label_col)
+        elif incremental:
+            old_data = Table(state["table"]["columns"], [tuple(row) for row in state["table"]["rows"]])
+            updated = _update_index(old_data, BM25.from_dict(state["bm25"]), sources, search_cols, label_col)
+        data, bm25 = updated or _build_index(sources, search_cols, label_col, weights)
+        _write_index(path, {
+            "version": INDEX_VERSION,
+            "sources": [{"label": label, "file": filepath.name, "mtime_ns": stat.st_mtime_ns,
+                         "size": stat.st_size, "sha1": _file_digest(filepath)}
+                        for (label, filepath), stat in zip(sources, stats)],
+            "search_cols": list(search_cols),
+            "weights": weights,
+            "tokenizer": tokenizer,
+            "rows": len(data.rows)
+        }, {"table": data.to_dict(), "bm25": bm25.to_dict()})
+
+    _INDEX_CACHE[cache_key] = (fingerprint, data, bm25)
+    return data, bm25
+
+
+def clear_index_cache(persisted=False):
+    """Drop in-memory indexes; with persisted=True also remove files in INDEX_DIR"""
+    _INDEX_CACHE.clear()
+    if persisted and INDEX_DIR.exists():
+        for path in INDEX_DIR.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def _rank_rows(data, bm25, output_cols, tokens, max_results):
+    """Project the top-scoring rows for a tokenized query onto output_cols"""
     results = []
-    for idx, score in ranked[:max_results]:
+    for idx, score in bm25.score_tokens(tokens, top_k=max_results):
         if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
+            results.append(data.project(idx, output_cols))
     return results
 
 
-def detect_domain(query):
-    """Auto-detect the most relevant domain from query"""
-    query_lower = query.lower()
-
-    domain_keywords = {
-        "color": ["color", "palette", "hex", "#", "rgb"],
-        "chart": ["chart", "graph", "visualization", "trend", "bar", "pie", "scatter", "heatmap", "funnel"],
-        "landing": ["landing", "page", "cta", "conversion", "hero", "testimonial", "pricing", "section"],
-        "product": ["saas", "ecommerce", "e-commerce", "fintech", "healthcare", "gaming", "portfolio", "crypto", "dashboard"],
-        "prompt": ["prompt", "css", "implementation", "variable", "checklist", "tailwind"],
-        "style": ["style", "design", "ui", "minimalism", "glassmorphism", "neumorphism", "brutalism", "dark mode", "flat", "aurora"],
-        "ux": ["ux", "usability", "accessibility", "wcag", "touch", "scroll", "animation", "keyboard", "navigation", "mobile"],
-        "typography": ["font", "typography", "heading", "serif", "sans"],
-        "icons": ["icon", "icons", "lucide", "heroicons", "symbol", "glyph", "pictogram", "svg icon"],
-        "react": ["react", "next.js", "nextjs", "suspense", "memo", "usecallback", "useeffect", "rerender", "bundle", "waterfall", "barrel", "dynamic import", "rsc", "server component"],
-        "web": ["aria", "focus", "outline", "semantic", "virtualize", "autocomplete", "form", "input type", "preconnect"]
-    }
+def _search_csv(filepath, search_cols, output_cols, query, max_results, weights=None):
+    """Core search function using BM25 (BM25F when column weights are given)"""
+    if not filepath.exists():
+        return []
+
+    data, bm25 = _get_index(filepath, search_cols, weights)
+    return _rank_rows(data, bm25, output_cols, bm25.tokenize(query), max_results)
+
 
-    scores = {domain: sum(1 for kw in keywords if kw in query_lower) for domain, keywords in domain_keywords.items()}
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "style"
+def detect_domain(query, idf_weighted=None):
+    """
+    Auto-detect the most relevant domain from query: the domain with the
+    most DOMAIN_KEYWORDS occurring in it (substring match), "style" when
+    none do. idf_weighted (default DOMAIN_IDF_WEIGHTING) weighs each
+    keyword by how few domain indexes contain it (see
+    _domain_keyword_weights()) instead of counting it as 1.
+    """
+    matcher, keyword_domains = _domain_matcher()
+    found = matcher.find(query.lower())
+    if not found:
+        return "style"
+    weights = _domain_keyword_weights() if (DOMAIN_IDF_WEIGHTING if idf_weighted is None else idf_weighted) else None
+    scores = [0] * len(DOMAIN_KEYWORDS)
+    for kw in found:
+        for pos in keyword_domains[kw]:
+            scores[pos] += weights[kw] if weights else 1
+    # First domain in DOMAIN_KEYWORDS order wins ties
+    return list(DOMAIN_KEYWORDS)[scores.index(max(scores))]
 
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
+    return search_many([(query, domain, max_results)])[0]
 
+
+def _search_domain(domain, requests):
+    """Answer every (position, query, max_results) request against one domain index"""
     config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
     filepath = DATA_DIR / config["file"]
+    index = []
 
-    if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
+    def rank(query, max_results):
+        # The index is only loaded once a request misses the result cache
+        if not index:
+            index.extend(_get_index(filepath, config["search_cols"], config.get("weights")))
+        data, bm25 = index
+        return _rank_rows(data, bm25, config["output_cols"], bm25.tokenize(query), max_results)
 
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
+    answers = []
+    for pos, query, max_results in requests:
+        results = _cached_results("search", domain, filepath, config, query, max_results,
+                                  lambda: rank(query, max_results))
+        if results is None:
+            answers.append((pos, {"error": f"File not found: {filepath}", "domain": domain}))
+            continue
+        answers.append((pos, {
+            "domain": domain,
+            "query": query,
+            "file": config["file"],
+            "count": len(results),
+            "results": results
+        }))
+    return answers
 
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+
+def search_many(queries, max_workers=None):
+    """
+    Run many searches in one pass.
+
+    queries: iterable of (query, domain, max_results) - domain may be None
+    for auto-detection and max_results may be omitted. Queries are grouped
+    by domain so each index is loaded once, and each distinct query string
+    is tokenized once (query tokens are LRU-cached). max_workers > 1 fans the domain groups out over a
+    thread pool.
+
+    Returns one search() result dict per query, in input order.
+    """
+    groups = defaultdict(list)
+    count = 0
+    for pos, item in enumerate(queries):
+        query = item[0]
+        domain = item[1] if len(item) > 1 else None
+        max_results = item[2] if len(item) > 2 else MAX_RESULTS
+        if domain is None:
+            domain = detect_domain(query)
+        groups[domain].append((pos, query, max_results))
+        count = pos + 1
+
+    output = [None] * count
+    if max_workers and max_workers > 1 and len(groups) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(groups))) as pool:
+            batches = list(pool.map(lambda item: _search_domain(*item), groups.items()))
+    else:
+        batches = [_search_domain(domain, requests) for domain, requests in groups.items()]
+
+    for answers in batches:
+        for pos, result in answers:
+            output[pos] = result
+    return output
 
 
 def search_stack(query, stack, max_results=MAX_RESULTS):
@@ -242,12 +1197,11 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         return {"error": f"Unknown stack: {stack}. Available: {', '.join(AVAILABLE_STACKS)}"}
 
     filepath = DATA_DIR / STACK_CONFIG[stack]["file"]
-
-    if not filepath.exists():
+    results = _cached_results("stack", stack, filepath, _STACK_COLS, query, max_results, lambda: _search_csv(
+        filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results, _STACK_COLS.get("weights")))
+    if results is None:
         return {"error": f"Stack file not found: {filepath}", "stack": stack}
 
-    results = _search_csv(filepath, _STACK_COLS["search_cols"], _STACK_COLS["output_cols"], query, max_results)
-
     return {
         "domain": "stack",
         "stack": stack,
@@ -256,3 +1210,51 @@ def search_stack(query, stack, max_results=MAX_RESULTS):
         "count": len(results),
         "results": results
     }
+
+
+def search_stacks(query, stacks=None, max_results=MAX_RESULTS):
+    """
+    Search several stacks in one call (stacks=None means all).
+
+    Uses one combined index over every STACK_CONFIG CSV, so IDF statistics
+    come from the union rather than per file. Results are ranked globally,
+    and a guideline that appears in several stacks (same title) is returned
+    once - its best-scoring row - with all of them listed in its "Stack" field.
+    """
+    stacks = list(stacks) if stacks else list(AVAILABLE_STACKS)
+    unknown = [stack for stack in stacks if stack not in STACK_CONFIG]
+    if unknown:
+        return {"error": f"Unknown stack: {', '.join(unknown)}. Available: {', '.join(AVAILABLE_STACKS)}"}
+
+    sources = [(stack, DATA_DIR / config["file"]) for stack, config in STACK_CONFIG.items()
+               if (DATA_DIR / config["file"]).exists()]
+    if not sources:
+        return {"error": f"No stack files found in {DATA_DIR / 'stacks'}", "stack": ", ".join(stacks)}
+
+    data, bm25 = _get_corpus_index(sources, _STACK_COLS["search_cols"], STACK_LABEL_COL, _STACK_COLS.get("weights"))
+    output_cols = [STACK_LABEL_COL] + _STACK_COLS["output_cols"]
+    wanted = set(stacks)
+
+    results = []
+    seen = {}
+    for idx, score in bm25.score(query):
+        stack = data.get(idx, STACK_LABEL_COL)
+        if stack not in wanted:
+            continue
+        key = " ".join(str(data.get(idx, "Guideline")).lower().split())
+        if key in seen:
+            merged = seen[key]
+            if stack not in merged[STACK_LABEL_COL].split(", "):
+                merged[STACK_LABEL_COL] += f", {stack}"
+        elif len(results) < max_results:
+            seen[key] = data.project(idx, output_cols)
+            results.append(seen[key])
+
+    return {
+        "domain": "stack",
+        "stack": "all" if wanted == set(AVAILABLE_STACKS) else ", ".join(stacks),
+        "query": query,
+        "file": "stacks/*.csv",
+        "count": len(results),
+        "results": results
+    }
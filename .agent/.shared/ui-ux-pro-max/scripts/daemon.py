@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UI/UX Pro Max Search Daemon - keeps every CSV_CONFIG / STACK_CONFIG index
+hot in memory and answers JSON queries over a Unix domain socket.
+Usage: python search.py --serve [--socket PATH]
+
+Protocol: one JSON object per line in each direction, any number of
+requests per connection.
+  {"op": "search", "query": "...", "domain": null, "max_results": 3}
+  {"op": "stack", "query": "...", "stack": "react", "max_results": 3}
+  {"op": "stacks", "query": "...", "stacks": ["react", "nextjs"], "max_results": 3}
+  {"op": "ping"}
+  {"op": "stats"}    (result cache hit/miss counters)
+
+The client side only needs json/socket (socket is imported once a socket
+file exists), so search.py tries the daemon before importing core (and
+loading indexes). The client only connects to a socket owned by the current
+user: the default path in the shared temp dir is predictable, and another
+user could otherwise create it first and answer queries.
+"""
+
+import json
+import os
+import zlib
+
+SOCKET_ENV = "UIPRO_SEARCH_SOCKET"
+CLIENT_TIMEOUT = 10.0
+
+
+def _temp_dir():
+    """tempfile.gettempdir() without importing tempfile on the common paths"""
+    for name in ("TMPDIR", "TEMP", "TMP"):
+        if os.environ.get(name):
+            return os.environ[name]
+    if os.name == "posix" and os.path.isdir("/tmp"):
+        return "/tmp"
+    import tempfile
+    return tempfile.gettempdir()
+
+
+def default_socket_path():
+    """Socket path: $UIPRO_SEARCH_SOCKET, else one per data directory in the temp dir"""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "data")
+    digest = zlib.crc32(data_dir.encode('utf-8'))
+    return os.path.join(_temp_dir(), f"uipro-search-{digest:08x}.sock")
+
+
+# ============ CLIENT ============
+class Client:
+    """Persistent connection to a running daemon (use as a context manager)"""
+
+    def __init__(self, socket_path=None, timeout=CLIENT_TIMEOUT):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+
+    def connect(self):
+        """Connect; returns False when no daemon is listening (or the socket isn't ours)"""
+        try:
+            owner = os.stat(self.socket_path).st_uid
+        except OSError:
+            return False
+        if hasattr(os, "getuid") and owner != os.getuid():
+            return False
+        import socket
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            return False
+        self._sock = sock
+        self._reader = sock.makefile('rb')
+        return True
+
+    def request(self, payload):
+        """Send one request and return the decoded response, or None on failure"""
+        if self._sock is None:
+            return None
+        try:
+            self._sock.sendall(json.dumps(payload, ensure_ascii=False).encode('utf-8') + b"\n")
+            line = self._reader.readline()
+        except OSError:
+            self.close()
+            return None
+        return json.loads(line) if line else None
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._reader = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def request(payload, socket_path=None):
+    """One-shot request; None when the daemon isn't running"""
+    with Client(socket_path) as client:
+        return client.request(payload)
+
+
+# ============ SERVER ============
+def handle(payload):
+    """Dispatch one decoded request to core (also serves search.py --jsonl object lines)"""
+    from core import MAX_RESULTS, result_cache_stats, search, search_stack, search_stacks
+
+    op = payload.get("op", "search")
+    if op == "ping":
+        return {"status": "ok", "pid": os.getpid()}
+    if op == "stats":
+        return {"result_cache": result_cache_stats()}
+    if op == "search":
+        return search(payload["query"], payload.get("domain"), payload.get("max_results", MAX_RESULTS))
+    if op == "stack":
+        return search_stack(payload["query"], payload["stack"], payload.get("max_results", MAX_RESULTS))
+    if op == "stacks":
+        return search_stacks(payload["query"], payload.get("stacks"), payload.get("max_results", MAX_RESULTS))
+    return {"error": f"Unknown op: {op}"}
+
+
+def warm_indexes():
+    """Build/load every domain, stack and cross-stack index into memory"""
+    from core import CSV_CONFIG, DATA_DIR, STACK_CONFIG, search, search_stack, search_stacks
+
+    count = 0
+    for domain, config in CSV_CONFIG.items():
+        if (DATA_DIR / config["file"]).exists():
+            search("", domain)
+            count += 1
+    for stack, config in STACK_CONFIG.items():
+        if (DATA_DIR / config["file"]).exists():
+            search_stack("", stack)
+            count += 1
+    search_stacks("", None)
+    return count + 1
+
+
+def serve(socket_path=None):
+    """Run the daemon in the foreground until interrupted (SIGINT/SIGTERM)"""
+    import signal
+    import socket
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise SystemExit("Error: --serve needs Unix domain sockets, which this platform lacks")
+
+    path = socket_path or default_socket_path()
+    if os.path.exists(path):
+        if request({"op": "ping"}, path):
+            raise SystemExit(f"Error: a search daemon is already listening on {path}")
+        try:
+            os.unlink(path)  # Stale socket from a daemon that didn't shut down cleanly
+        except OSError as e:
+            raise SystemExit(f"Error: can't remove stale socket {path}: {e}")
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    response = handle(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    response = {"error": f"Bad request: {e}"}
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    count = warm_indexes()
+    old_umask = os.umask(0o177)  # Socket is private to the current user
+    try:
+        server = Server(path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    print(f"UI Pro Max search daemon: {count} indexes loaded, listening on {path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
@@ -5,31 +5,39 @@ Design System Generator - Aggregates search results and applies reasoning
 to generate comprehensive design system recommendations.
 
 Usage:
-    from design_system import generate_design_system
+    from design_system import generate_design_system, generate_design_systems
     result = generate_design_system("SaaS dashboard", "My Project")
+    results = generate_design_systems(["SaaS dashboard", ("e-commerce luxury", "Shop")])
     
     # With persistence (Master + Overrides pattern)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True)
     result = generate_design_system("SaaS dashboard", "My Project", persist=True, page="dashboard")
+    result = generate_design_system("SaaS dashboard", "My Project", persist=True, pages=["dashboard", "checkout"])
 """
 
 import csv
 import json
 import os
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_many, DATA_DIR
+from template import Template
 
 
 # ============ CONFIGURATION ============
 REASONING_FILE = "ui-reasoning.csv"
+# Per-project record of what persist_design_system last wrote (content hash, source query, time)
+MANIFEST_FILE = "manifest.json"
 
+# Only style is re-ranked (_select_best_match); the rest use their top BM25F hit
 SEARCH_CONFIG = {
     "product": {"max_results": 1},
     "style": {"max_results": 3},
-    "color": {"max_results": 2},
-    "landing": {"max_results": 2},
-    "typography": {"max_results": 2}
+    "color": {"max_results": 1},
+    "landing": {"max_results": 1},
+    "typography": {"max_results": 1}
 }
 
 
@@ -39,6 +47,7 @@ class DesignSystemGenerator:
 
     def __init__(self):
         self.reasoning_data = self._load_reasoning()
+        self._index_reasoning()
 
     def _load_reasoning(self) -> list:
         """Load reasoning rules from CSV."""
@@ -49,47 +58,70 @@ class DesignSystemGenerator:
             return list(csv.DictReader(f))
 
     def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+        """Execute searches across multiple domains in one batched pass."""
+        batch = []
         for domain, config in SEARCH_CONFIG.items():
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                batch.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
-
-    def _find_reasoning_rule(self, category: str) -> dict:
-        """Find matching reasoning rule for a category."""
+                batch.append((query, domain, config["max_results"]))
+        return dict(zip(SEARCH_CONFIG.keys(), search_many(batch)))
+
+    def _index_reasoning(self):
+        """Precompute lowercased categories, keywords and parsed Decision_Rules once per load.
+
+        Every lookup keeps the first rule (lowest index) for its key, which is
+        the rule the exact / partial / keyword passes would have returned.
+        """
+        self._exact = {}  # UI_Category -> rule index
+        keywords = {}     # UI_Category word -> rule index
+        self._decision_rules = []
+        for i, rule in enumerate(self.reasoning_data):
+            ui_cat = rule.get("UI_Category", "").lower()
+            self._exact.setdefault(ui_cat, i)
+            for kw in ui_cat.replace("/", " ").replace("-", " ").split():
+                keywords.setdefault(kw, i)
+            try:
+                self._decision_rules.append(json.loads(rule.get("Decision_Rules", "{}")))
+            except json.JSONDecodeError:
+                self._decision_rules.append({})
+        # Substring candidates, in rule order
+        self._categories = sorted((i, ui_cat) for ui_cat, i in self._exact.items())
+        self._keywords = sorted((i, kw) for kw, i in keywords.items())
+
+    def _rule_index(self, category: str):
+        """Index of the matching reasoning rule for a category, or None."""
         category_lower = category.lower()
 
         # Try exact match first
-        for rule in self.reasoning_data:
-            if rule.get("UI_Category", "").lower() == category_lower:
-                return rule
+        index = self._exact.get(category_lower)
+        if index is not None:
+            return index
 
         # Try partial match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
+        for i, ui_cat in self._categories:
             if ui_cat in category_lower or category_lower in ui_cat:
-                return rule
+                return i
 
         # Try keyword match
-        for rule in self.reasoning_data:
-            ui_cat = rule.get("UI_Category", "").lower()
-            keywords = ui_cat.replace("/", " ").replace("-", " ").split()
-            if any(kw in category_lower for kw in keywords):
-                return rule
+        for i, kw in self._keywords:
+            if kw in category_lower:
+                return i
+        return None
 
-        return {}
+    def _find_reasoning_rule(self, category: str) -> dict:
+        """Find matching reasoning rule for a category."""
+        index = self._rule_index(category)
+        return self.reasoning_data[index] if index is not None else {}
 
     def _apply_reasoning(self, category: str, search_results: dict) -> dict:
         """Apply reasoning rules to search results."""
-        rule = self._find_reasoning_rule(category)
+        index = self._rule_index(category)
 
-        if not rule:
+        if index is None:
             return {
                 "pattern": "Hero + Features + CTA",
                 "style_priority": ["Minimalism", "Flat Design"],
@@ -101,12 +133,11 @@ class DesignSystemGenerator:
                 "severity": "MEDIUM"
             }
 
-        # Parse decision rules JSON
-        decision_rules = {}
-        try:
-            decision_rules = json.loads(rule.get("Decision_Rules", "{}"))
-        except json.JSONDecodeError:
-            pass
+        rule = self.reasoning_data[index]
+        # Decision rules JSON was parsed at load time; hand out a copy
+        decision_rules = self._decision_rules[index]
+        if isinstance(decision_rules, dict):
+            decision_rules = dict(decision_rules)
 
         return {
             "pattern": rule.get("Recommended_Pattern", ""),
@@ -236,231 +267,256 @@ class DesignSystemGenerator:
         }
 
 
+# ============ SHARED GENERATOR ============
+_GENERATOR = {}
+
+
+def get_generator() -> DesignSystemGenerator:
+    """Process-wide DesignSystemGenerator, reloaded when ui-reasoning.csv changes."""
+    try:
+        stat = os.stat(DATA_DIR / REASONING_FILE)
+        key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        key = None
+    if "generator" not in _GENERATOR or _GENERATOR["key"] != key:
+        _GENERATOR.update(key=key, generator=DesignSystemGenerator())
+    return _GENERATOR["generator"]
+
+
 # ============ OUTPUT FORMATTERS ============
 BOX_WIDTH = 90  # Wider box for more content
+_BOX_BORDER = "+" + "-" * (BOX_WIDTH - 1) + "+"
+_BOX_BLANK = "|" + " " * BOX_WIDTH + "|"
 
-def format_ascii_box(design_system: dict) -> str:
-    """Format design system as ASCII box with emojis (MCP-style)."""
-    project = design_system.get("project_name", "PROJECT")
-    pattern = design_system.get("pattern", {})
-    style = design_system.get("style", {})
-    colors = design_system.get("colors", {})
-    typography = design_system.get("typography", {})
-    effects = design_system.get("key_effects", "")
-    anti_patterns = design_system.get("anti_patterns", "")
-
-    def wrap_text(text: str, prefix: str, width: int) -> list:
-        """Wrap long text into multiple lines."""
-        if not text:
-            return []
-        words = text.split()
-        lines = []
-        current_line = prefix
-        for word in words:
-            if len(current_line) + len(word) + 1 <= width - 2:
-                current_line += (" " if current_line != prefix else "") + word
-            else:
-                if current_line != prefix:
-                    lines.append(current_line)
-                current_line = prefix + word
-        if current_line != prefix:
-            lines.append(current_line)
-        return lines
-
-    # Build sections from pattern
-    sections = pattern.get("sections", "").split(">")
-    sections = [s.strip() for s in sections if s.strip()]
-
-    # Build output lines
+
+@lru_cache(maxsize=4096)
+def _wrap_text(text: str, prefix: str, width: int = BOX_WIDTH) -> tuple:
+    """Wrap long text into multiple lines (memoized: the same style/color text recurs across systems)."""
+    if not text:
+        return ()
+    words = text.split()
     lines = []
-    w = BOX_WIDTH - 1
-
-    lines.append("+" + "-" * w + "+")
-    lines.append(f"|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM".ljust(BOX_WIDTH) + "|")
-    lines.append("+" + "-" * w + "+")
-    lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Pattern section
-    lines.append(f"|  PATTERN: {pattern.get('name', '')}".ljust(BOX_WIDTH) + "|")
-    if pattern.get('conversion'):
-        lines.append(f"|     Conversion: {pattern.get('conversion', '')}".ljust(BOX_WIDTH) + "|")
-    if pattern.get('cta_placement'):
-        lines.append(f"|     CTA: {pattern.get('cta_placement', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append("|     Sections:".ljust(BOX_WIDTH) + "|")
-    for i, section in enumerate(sections, 1):
-        lines.append(f"|       {i}. {section}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Style section
-    lines.append(f"|  STYLE: {style.get('name', '')}".ljust(BOX_WIDTH) + "|")
-    if style.get("keywords"):
-        for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    if style.get("best_for"):
-        for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    if style.get("performance") or style.get("accessibility"):
-        perf_a11y = f"Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}"
-        lines.append(f"|     {perf_a11y}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Colors section
-    lines.append("|  COLORS:".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Primary:    {colors.get('primary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Secondary:  {colors.get('secondary', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     CTA:        {colors.get('cta', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Background: {colors.get('background', '')}".ljust(BOX_WIDTH) + "|")
-    lines.append(f"|     Text:       {colors.get('text', '')}".ljust(BOX_WIDTH) + "|")
-    if colors.get("notes"):
-        for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Typography section
-    lines.append(f"|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}".ljust(BOX_WIDTH) + "|")
-    if typography.get("mood"):
-        for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    if typography.get("best_for"):
-        for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-    if typography.get("google_fonts_url"):
-        lines.append(f"|     Google Fonts: {typography.get('google_fonts_url', '')}".ljust(BOX_WIDTH) + "|")
-    if typography.get("css_import"):
-        lines.append(f"|     CSS Import: {typography.get('css_import', '')[:70]}...".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Key Effects section
-    if effects:
-        lines.append("|  KEY EFFECTS:".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(effects, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Anti-patterns section
-    if anti_patterns:
-        lines.append("|  AVOID (Anti-patterns):".ljust(BOX_WIDTH) + "|")
-        for line in wrap_text(anti_patterns, "|     ", BOX_WIDTH):
-            lines.append(line.ljust(BOX_WIDTH) + "|")
-        lines.append("|" + " " * BOX_WIDTH + "|")
-
-    # Pre-Delivery Checklist section
-    lines.append("|  PRE-DELIVERY CHECKLIST:".ljust(BOX_WIDTH) + "|")
-    checklist_items = [
-        "[ ] No emojis as icons (use SVG: Heroicons/Lucide)",
-        "[ ] cursor-pointer on all clickable elements",
-        "[ ] Hover states with smooth transitions (150-300ms)",
-        "[ ] Light mode: text contrast 4.5:1 minimum",
-        "[ ] Focus states visible for keyboard nav",
-        "[ ] prefers-reduced-motion respected",
-        "[ ] Responsive: 375px, 768px, 1024px, 1440px"
-    ]
-    for item in checklist_items:
-        lines.append(f"|     {item}".ljust(BOX_WIDTH) + "|")
-    lines.append("|" + " " * BOX_WIDTH + "|")
+    current_line = prefix
+    for word in words:
+        if len(current_line) + len(word) + 1 <= width - 2:
+            current_line += (" " if current_line != prefix else "") + word
+        else:
+            if current_line != prefix:
+                lines.append(current_line)
+            current_line = prefix + word
+    if current_line != prefix:
+        lines.append(current_line)
+    return tuple(lines)
 
-    lines.append("+" + "-" * w + "+")
 
-    return "\n".join(lines)
+def _template_context(design_system: dict) -> dict:
+    """The design system fields every template reads."""
+    return {
+        "project": design_system.get("project_name", "PROJECT"),
+        "pattern": design_system.get("pattern", {}),
+        "style": design_system.get("style", {}),
+        "colors": design_system.get("colors", {}),
+        "typography": design_system.get("typography", {}),
+        "effects": design_system.get("key_effects", ""),
+        "anti_patterns": design_system.get("anti_patterns", "")
+    }
+
+
+_TEMPLATE_PARAMS = "project pattern style colors typography effects anti_patterns"
+_TEMPLATE_NAMESPACE = {"BORDER": _BOX_BORDER, "BLANK": _BOX_BLANK, "wrap_text": _wrap_text}
+
+ASCII_BOX_TEMPLATE = """
+{BORDER}
+|  TARGET: {project} - RECOMMENDED DESIGN SYSTEM|
+{BORDER}
+{BLANK}
+|  PATTERN: {pattern.get('name', '')}|
+% if pattern.get('conversion'):
+|     Conversion: {pattern.get('conversion', '')}|
+% end
+% if pattern.get('cta_placement'):
+|     CTA: {pattern.get('cta_placement', '')}|
+% end
+|     Sections:|
+% for i, section in enumerate(sections, 1):
+|       {i}. {section}|
+% end
+{BLANK}
+|  STYLE: {style.get('name', '')}|
+% if style.get('keywords'):
+%   for line in wrap_text(f"Keywords: {style.get('keywords', '')}", "|     "):
+{line}|
+%   end
+% end
+% if style.get('best_for'):
+%   for line in wrap_text(f"Best For: {style.get('best_for', '')}", "|     "):
+{line}|
+%   end
+% end
+% if style.get('performance') or style.get('accessibility'):
+|     Performance: {style.get('performance', '')} | Accessibility: {style.get('accessibility', '')}|
+% end
+{BLANK}
+|  COLORS:|
+|     Primary:    {colors.get('primary', '')}|
+|     Secondary:  {colors.get('secondary', '')}|
+|     CTA:        {colors.get('cta', '')}|
+|     Background: {colors.get('background', '')}|
+|     Text:       {colors.get('text', '')}|
+% if colors.get('notes'):
+%   for line in wrap_text(f"Notes: {colors.get('notes', '')}", "|     "):
+{line}|
+%   end
+% end
+{BLANK}
+|  TYPOGRAPHY: {typography.get('heading', '')} / {typography.get('body', '')}|
+% if typography.get('mood'):
+%   for line in wrap_text(f"Mood: {typography.get('mood', '')}", "|     "):
+{line}|
+%   end
+% end
+% if typography.get('best_for'):
+%   for line in wrap_text(f"Best For: {typography.get('best_for', '')}", "|     "):
+{line}|
+%   end
+% end
+% if typography.get('google_fonts_url'):
+|     Google Fonts: {typography.get('google_fonts_url', '')}|
+% end
+% if typography.get('css_import'):
+|     CSS Import: {typography.get('css_import', '')[:70]}...|
+% end
+{BLANK}
+% if effects:
+|  KEY EFFECTS:|
+%   for line in wrap_text(effects, "|     "):
+{line}|
+%   end
+{BLANK}
+% end
+% if anti_patterns:
+|  AVOID (Anti-patterns):|
+%   for line in wrap_text(anti_patterns, "|     "):
+{line}|
+%   end
+{BLANK}
+% end
+|  PRE-DELIVERY CHECKLIST:|
+|     [ ] No emojis as icons (use SVG: Heroicons/Lucide)|
+|     [ ] cursor-pointer on all clickable elements|
+|     [ ] Hover states with smooth transitions (150-300ms)|
+|     [ ] Light mode: text contrast 4.5:1 minimum|
+|     [ ] Focus states visible for keyboard nav|
+|     [ ] prefers-reduced-motion respected|
+|     [ ] Responsive: 375px, 768px, 1024px, 1440px|
+{BLANK}
+{BORDER}
+"""
+
+MARKDOWN_TEMPLATE = """
+## Design System: {project}
+
+### Pattern
+- **Name:** {pattern.get('name', '')}
+% if pattern.get('conversion'):
+- **Conversion Focus:** {pattern.get('conversion', '')}
+% end
+% if pattern.get('cta_placement'):
+- **CTA Placement:** {pattern.get('cta_placement', '')}
+% end
+% if pattern.get('color_strategy'):
+- **Color Strategy:** {pattern.get('color_strategy', '')}
+% end
+- **Sections:** {pattern.get('sections', '')}
+
+### Style
+- **Name:** {style.get('name', '')}
+% if style.get('keywords'):
+- **Keywords:** {style.get('keywords', '')}
+% end
+% if style.get('best_for'):
+- **Best For:** {style.get('best_for', '')}
+% end
+% if style.get('performance') or style.get('accessibility'):
+- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}
+% end
+
+### Colors
+| Role | Hex |
+|------|-----|
+| Primary | {colors.get('primary', '')} |
+| Secondary | {colors.get('secondary', '')} |
+| CTA | {colors.get('cta', '')} |
+| Background | {colors.get('background', '')} |
+| Text | {colors.get('text', '')} |
+% if colors.get('notes'):
+
+*Notes: {colors.get('notes', '')}*
+% end
+
+### Typography
+- **Heading:** {typography.get('heading', '')}
+- **Body:** {typography.get('body', '')}
+% if typography.get('mood'):
+- **Mood:** {typography.get('mood', '')}
+% end
+% if typography.get('best_for'):
+- **Best For:** {typography.get('best_for', '')}
+% end
+% if typography.get('google_fonts_url'):
+- **Google Fonts:** {typography.get('google_fonts_url', '')}
+% end
+% if typography.get('css_import'):
+- **CSS Import:**
+```css
+{typography.get('css_import', '')}
+```
+% end
+
+% if effects:
+### Key Effects
+{effects}
+
+% end
+% if anti_patterns:
+### Avoid (Anti-patterns)
+% for anti in anti_patterns.split(' + '):
+- {anti}
+% end
+
+% end
+### Pre-Delivery Checklist
+- [ ] No emojis as icons (use SVG: Heroicons/Lucide)
+- [ ] cursor-pointer on all clickable elements
+- [ ] Hover states with smooth transitions (150-300ms)
+- [ ] Light mode: text contrast 4.5:1 minimum
+- [ ] Focus states visible for keyboard nav
+- [ ] prefers-reduced-motion respected
+- [ ] Responsive: 375px, 768px, 1024px, 1440px
+
+"""
+
+_ASCII_BOX = Template(ASCII_BOX_TEMPLATE, _TEMPLATE_PARAMS + " sections", box=BOX_WIDTH,
+                      namespace=_TEMPLATE_NAMESPACE, name="ascii_box")
+_MARKDOWN = Template(MARKDOWN_TEMPLATE, _TEMPLATE_PARAMS, namespace=_TEMPLATE_NAMESPACE, name="markdown")
+
+
+def format_ascii_box(design_system: dict) -> str:
+    """Format design system as ASCII box with emojis (MCP-style)."""
+    context = _template_context(design_system)
+    sections = [s.strip() for s in context["pattern"].get("sections", "").split(">")]
+    return _ASCII_BOX.render(sections=[s for s in sections if s], **context)
 
 
 def format_markdown(design_system: dict) -> str:
     """Format design system as markdown."""
-    project = design_system.get("project_name", "PROJECT")
-    pattern = design_system.get("pattern", {})
-    style = design_system.get("style", {})
-    colors = design_system.get("colors", {})
-    typography = design_system.get("typography", {})
-    effects = design_system.get("key_effects", "")
-    anti_patterns = design_system.get("anti_patterns", "")
-
-    lines = []
-    lines.append(f"## Design System: {project}")
-    lines.append("")
-
-    # Pattern section
-    lines.append("### Pattern")
-    lines.append(f"- **Name:** {pattern.get('name', '')}")
-    if pattern.get('conversion'):
-        lines.append(f"- **Conversion Focus:** {pattern.get('conversion', '')}")
-    if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    if pattern.get('color_strategy'):
-        lines.append(f"- **Color Strategy:** {pattern.get('color_strategy', '')}")
-    lines.append(f"- **Sections:** {pattern.get('sections', '')}")
-    lines.append("")
-
-    # Style section
-    lines.append("### Style")
-    lines.append(f"- **Name:** {style.get('name', '')}")
-    if style.get('keywords'):
-        lines.append(f"- **Keywords:** {style.get('keywords', '')}")
-    if style.get('best_for'):
-        lines.append(f"- **Best For:** {style.get('best_for', '')}")
-    if style.get('performance') or style.get('accessibility'):
-        lines.append(f"- **Performance:** {style.get('performance', '')} | **Accessibility:** {style.get('accessibility', '')}")
-    lines.append("")
-
-    # Colors section
-    lines.append("### Colors")
-    lines.append(f"| Role | Hex |")
-    lines.append(f"|------|-----|")
-    lines.append(f"| Primary | {colors.get('primary', '')} |")
-    lines.append(f"| Secondary | {colors.get('secondary', '')} |")
-    lines.append(f"| CTA | {colors.get('cta', '')} |")
-    lines.append(f"| Background | {colors.get('background', '')} |")
-    lines.append(f"| Text | {colors.get('text', '')} |")
-    if colors.get("notes"):
-        lines.append(f"\n*Notes: {colors.get('notes', '')}*")
-    lines.append("")
-
-    # Typography section
-    lines.append("### Typography")
-    lines.append(f"- **Heading:** {typography.get('heading', '')}")
-    lines.append(f"- **Body:** {typography.get('body', '')}")
-    if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
-    if typography.get("best_for"):
-        lines.append(f"- **Best For:** {typography.get('best_for', '')}")
-    if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** {typography.get('google_fonts_url', '')}")
-    if typography.get("css_import"):
-        lines.append(f"- **CSS Import:**")
-        lines.append(f"```css")
-        lines.append(f"{typography.get('css_import', '')}")
-        lines.append(f"```")
-    lines.append("")
-
-    # Key Effects section
-    if effects:
-        lines.append("### Key Effects")
-        lines.append(f"{effects}")
-        lines.append("")
-
-    # Anti-patterns section
-    if anti_patterns:
-        lines.append("### Avoid (Anti-patterns)")
-        newline_bullet = '\n- '
-        lines.append(f"- {anti_patterns.replace(' + ', newline_bullet)}")
-        lines.append("")
-
-    # Pre-Delivery Checklist section
-    lines.append("### Pre-Delivery Checklist")
-    lines.append("- [ ] No emojis as icons (use SVG: Heroicons/Lucide)")
-    lines.append("- [ ] cursor-pointer on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard nav")
-    lines.append("- [ ] prefers-reduced-motion respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("")
-
-    return "\n".join(lines)
+    return _MARKDOWN.render(**_template_context(design_system))
 
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           pages: list = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,24 +527,58 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        pages: Optional list of page names for page-specific override files
 
     Returns:
         Formatted design system string
     """
-    generator = DesignSystemGenerator()
-    design_system = generator.generate(query, project_name)
+    design_system = get_generator().generate(query, project_name)
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(design_system, page, output_dir, query, pages=pages)
+
+    return render_design_system(design_system, output_format)
+
+
+def generate_design_systems(queries: list, output_format: str = "ascii",
+                            persist: bool = False, output_dir: str = None) -> list:
+    """
+    Batch entry point: one formatted design system per query, in order.
+
+    Every query shares the process-wide generator and the in-memory search
+    indexes, so the reasoning CSV and each domain index load once per batch.
+
+    Args:
+        queries: Query strings, or (query, project_name) pairs
+        output_format: "ascii" (default) or "markdown"
+        persist: If True, save each design system to design-system/ folder
+        output_dir: Optional output directory (defaults to current working directory)
 
+    Returns:
+        List of formatted design system strings
+    """
+    generator = get_generator()
+    outputs = []
+    for item in queries:
+        query, project_name = (item, None) if isinstance(item, str) else item
+        design_system = generator.generate(query, project_name)
+        if persist:
+            persist_design_system(design_system, None, output_dir, query)
+        outputs.append(render_design_system(design_system, output_format))
+    return outputs
+
+
+def render_design_system(design_system: dict, output_format: str = "ascii") -> str:
+    """Format a generated design system as "ascii" (default) or "markdown"."""
     if output_format == "markdown":
         return format_markdown(design_system)
     return format_ascii_box(design_system)
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None, max_workers: int = 1) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -497,9 +587,19 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of page names; their overrides are searched in one
+            batch, then rendered and written
+        max_workers: Threads rendering/writing pages (default 1). On a local disk
+            the pool is slower than one thread; raise it for slow or network
+            filesystems, where each write waits on I/O
+    
+    Files whose rendered content (ignoring the Generated: timestamp) is
+    unchanged since the last run, per the folder's manifest.json, are left
+    untouched.
     
     Returns:
-        dict with created file paths and status
+        dict with status, created_files (every file, written or not),
+        written_files, skipped_files and skipped (count)
     """
     base_dir = Path(output_dir) if output_dir else Path.cwd()
     
@@ -510,405 +610,479 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
     design_system_dir = base_dir / "design-system" / project_slug
     pages_dir = design_system_dir / "pages"
     
-    created_files = []
-    
     # Create directories
     design_system_dir.mkdir(parents=True, exist_ok=True)
     pages_dir.mkdir(parents=True, exist_ok=True)
     
-    master_file = design_system_dir / "MASTER.md"
+    manifest_file = design_system_dir / MANIFEST_FILE
+    manifest = _load_manifest(manifest_file)
     
     # Generate and write MASTER.md
-    master_content = format_master_md(design_system)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        f.write(master_content)
-    created_files.append(str(master_file))
+    master_file = design_system_dir / "MASTER.md"
+    outcomes = [_write_if_changed(master_file, format_master_md(design_system), "MASTER.md",
+                                  manifest.get("MASTER.md"), page_query)]
+    
+    # Page override files with intelligent content
+    page_names = ([page] if page else []) + list(pages or [])
+    if page_names:
+        outcomes.extend(_persist_pages(design_system, page_names, pages_dir, page_query, max_workers, manifest))
     
-    # If page is specified, create page override file with intelligent content
-    if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
-        with open(page_file, 'w', encoding='utf-8') as f:
-            f.write(page_content)
-        created_files.append(str(page_file))
+    written = [(path, key, entry) for path, key, entry, changed in outcomes if changed]
+    if written:
+        manifest.update((key, entry) for _, key, entry in written)
+        _write_atomic(manifest_file, json.dumps({"files": manifest}, indent=2, ensure_ascii=False) + "\n")
     
     return {
         "status": "success",
         "design_system_dir": str(design_system_dir),
-        "created_files": created_files
+        "created_files": [path for path, _, _, _ in outcomes],
+        "written_files": [path for path, _, _ in written],
+        "skipped_files": [path for path, _, _, changed in outcomes if not changed],
+        "skipped": len(outcomes) - len(written)
     }
 
 
+_GENERATED_RE = re.compile(r"(\*\*Generated:\*\* )\d{4}-\d\d-\d\d \d\d:\d\d:\d\d")
+
+
+def _content_hash(content: str) -> str:
+    """sha256 of rendered output, ignoring the Generated: timestamp it embeds."""
+    import hashlib
+    return hashlib.sha256(_GENERATED_RE.sub(r"\1", content).encode('utf-8')).hexdigest()
+
+
+def _load_manifest(path: Path) -> dict:
+    """{relative path: {hash, query, generated, size, mtime_ns}}; empty when missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            files = json.load(f).get("files", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return files if isinstance(files, dict) else {}
+
+
+def _write_if_changed(path: Path, content: str, key: str, entry: dict, query: str = None) -> tuple:
+    """
+    Write content unless the manifest entry shows the file already holds it.
+
+    The file must also still have the size/mtime recorded when it was
+    written, so hand-edited or deleted files are regenerated.
+    Returns (path, manifest key, manifest entry, written?).
+    """
+    digest = _content_hash(content)
+    if entry and entry.get("hash") == digest:
+        try:
+            stat = path.stat()
+            if (stat.st_size, stat.st_mtime_ns) == (entry.get("size"), entry.get("mtime_ns")):
+                return str(path), key, entry, False
+        except OSError:
+            pass
+    _write_atomic(path, content)
+    stat = path.stat()
+    return str(path), key, {
+        "hash": digest,
+        "query": query,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns
+    }, True
+
+
+def _write_atomic(path: Path, content: str):
+    """Write via a temp file in the same directory + rename, so readers never see a partial file."""
+    import tempfile
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _persist_pages(design_system: dict, page_names: list, pages_dir: Path, page_query: str = None,
+                   max_workers: int = 1, manifest: dict = None) -> list:
+    """
+    Write one override file per page: all searches in one batch, render + write
+    serially or, with max_workers > 1, on a thread pool.
+    Returns one _write_if_changed() outcome per distinct page file.
+    """
+    manifest = manifest or {}
+    # One file per slug; the first page name wins
+    by_slug = {}
+    for name in page_names:
+        by_slug.setdefault(name.lower().replace(' ', '-'), name)
+
+    batch = []
+    for name in by_slug.values():
+        batch.extend(_override_searches(name, page_query))
+    results = search_many(batch)
+
+    def write(job):
+        i, (slug, name) = job
+        overrides = _build_overrides(name, page_query, *results[3 * i:3 * i + 3])
+        key = f"pages/{slug}.md"
+        return _write_if_changed(pages_dir / f"{slug}.md", format_page_override_md(design_system, name, page_query, overrides),
+                                 key, manifest.get(key), page_query)
+
+    jobs = list(enumerate(by_slug.items()))
+    workers = min(max_workers or 1, len(jobs))
+    if workers <= 1:
+        return [write(job) for job in jobs]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write, jobs))
+
+
+MASTER_TEMPLATE = """
+# Design System Master File
+
+> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.
+> If that file exists, its rules **override** this Master file.
+> If not, strictly follow the rules below.
+
+---
+
+**Project:** {project}
+**Generated:** {timestamp}
+**Category:** {category}
+
+---
+
+## Global Rules
+
+### Color Palette
+
+| Role | Hex | CSS Variable |
+|------|-----|--------------|
+| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |
+| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |
+| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |
+| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |
+| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |
+
+% if colors.get('notes'):
+**Color Notes:** {colors.get('notes', '')}
+
+% end
+### Typography
+
+- **Heading Font:** {typography.get('heading', 'Inter')}
+- **Body Font:** {typography.get('body', 'Inter')}
+% if typography.get('mood'):
+- **Mood:** {typography.get('mood', '')}
+% end
+% if typography.get('google_fonts_url'):
+- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})
+% end
+
+% if typography.get('css_import'):
+**CSS Import:**
+```css
+{typography.get('css_import', '')}
+```
+
+% end
+### Spacing Variables
+
+| Token | Value | Usage |
+|-------|-------|-------|
+| `--space-xs` | `4px` / `0.25rem` | Tight gaps |
+| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |
+| `--space-md` | `16px` / `1rem` | Standard padding |
+| `--space-lg` | `24px` / `1.5rem` | Section padding |
+| `--space-xl` | `32px` / `2rem` | Large gaps |
+| `--space-2xl` | `48px` / `3rem` | Section margins |
+| `--space-3xl` | `64px` / `4rem` | Hero padding |
+
+### Shadow Depths
+
+| Level | Value | Usage |
+|-------|-------|-------|
+| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |
+| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |
+| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |
+| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |
+
+---
+
+## Component Specs
+
+### Buttons
+
+```css
+/* Primary Button */
+.btn-primary {{
+  background: {colors.get('cta', '#F97316')};
+  color: white;
+  padding: 12px 24px;
+  border-radius: 8px;
+  font-weight: 600;
+  transition: all 200ms ease;
+  cursor: pointer;
+}}
+
+.btn-primary:hover {{
+  opacity: 0.9;
+  transform: translateY(-1px);
+}}
+
+/* Secondary Button */
+.btn-secondary {{
+  background: transparent;
+  color: {colors.get('primary', '#2563EB')};
+  border: 2px solid {colors.get('primary', '#2563EB')};
+  padding: 12px 24px;
+  border-radius: 8px;
+  font-weight: 600;
+  transition: all 200ms ease;
+  cursor: pointer;
+}}
+```
+
+### Cards
+
+```css
+.card {{
+  background: {colors.get('background', '#FFFFFF')};
+  border-radius: 12px;
+  padding: 24px;
+  box-shadow: var(--shadow-md);
+  transition: all 200ms ease;
+  cursor: pointer;
+}}
+
+.card:hover {{
+  box-shadow: var(--shadow-lg);
+  transform: translateY(-2px);
+}}
+```
+
+### Inputs
+
+```css
+.input {{
+  padding: 12px 16px;
+  border: 1px solid #E2E8F0;
+  border-radius: 8px;
+  font-size: 16px;
+  transition: border-color 200ms ease;
+}}
+
+.input:focus {{
+  border-color: {colors.get('primary', '#2563EB')};
+  outline: none;
+  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;
+}}
+```
+
+### Modals
+
+```css
+.modal-overlay {{
+  background: rgba(0, 0, 0, 0.5);
+  backdrop-filter: blur(4px);
+}}
+
+.modal {{
+  background: white;
+  border-radius: 16px;
+  padding: 32px;
+  box-shadow: var(--shadow-xl);
+  max-width: 500px;
+  width: 90%;
+}}
+```
+
+---
+
+## Style Guidelines
+
+**Style:** {style.get('name', 'Minimalism')}
+
+% if style.get('keywords'):
+**Keywords:** {style.get('keywords', '')}
+
+% end
+% if style.get('best_for'):
+**Best For:** {style.get('best_for', '')}
+
+% end
+% if effects:
+**Key Effects:** {effects}
+
+% end
+### Page Pattern
+
+**Pattern Name:** {pattern.get('name', '')}
+
+% if pattern.get('conversion'):
+- **Conversion Strategy:** {pattern.get('conversion', '')}
+% end
+% if pattern.get('cta_placement'):
+- **CTA Placement:** {pattern.get('cta_placement', '')}
+% end
+- **Section Order:** {pattern.get('sections', '')}
+
+---
+
+## Anti-Patterns (Do NOT Use)
+
+% for anti in anti_list:
+- ❌ {anti}
+% end
+
+### Additional Forbidden Patterns
+
+- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)
+- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer
+- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout
+- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio
+- ❌ **Instant state changes** — Always use transitions (150-300ms)
+- ❌ **Invisible focus states** — Focus states must be visible for a11y
+
+---
+
+## Pre-Delivery Checklist
+
+Before delivering any UI code, verify:
+
+- [ ] No emojis used as icons (use SVG instead)
+- [ ] All icons from consistent icon set (Heroicons/Lucide)
+- [ ] `cursor-pointer` on all clickable elements
+- [ ] Hover states with smooth transitions (150-300ms)
+- [ ] Light mode: text contrast 4.5:1 minimum
+- [ ] Focus states visible for keyboard navigation
+- [ ] `prefers-reduced-motion` respected
+- [ ] Responsive: 375px, 768px, 1024px, 1440px
+- [ ] No content hidden behind fixed navbars
+- [ ] No horizontal scroll on mobile
+
+"""
+
+_MASTER = Template(MASTER_TEMPLATE, _TEMPLATE_PARAMS + " timestamp category anti_list",
+                   namespace=_TEMPLATE_NAMESPACE, name="master")
+
+
 def format_master_md(design_system: dict) -> str:
     """Format design system as MASTER.md with hierarchical override logic."""
-    project = design_system.get("project_name", "PROJECT")
-    pattern = design_system.get("pattern", {})
-    style = design_system.get("style", {})
-    colors = design_system.get("colors", {})
-    typography = design_system.get("typography", {})
-    effects = design_system.get("key_effects", "")
-    anti_patterns = design_system.get("anti_patterns", "")
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    lines = []
-    
-    # Logic header
-    lines.append("# Design System Master File")
-    lines.append("")
-    lines.append("> **LOGIC:** When building a specific page, first check `design-system/pages/[page-name].md`.")
-    lines.append("> If that file exists, its rules **override** this Master file.")
-    lines.append("> If not, strictly follow the rules below.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    lines.append(f"**Project:** {project}")
-    lines.append(f"**Generated:** {timestamp}")
-    lines.append(f"**Category:** {design_system.get('category', 'General')}")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Global Rules section
-    lines.append("## Global Rules")
-    lines.append("")
-    
-    # Color Palette
-    lines.append("### Color Palette")
-    lines.append("")
-    lines.append("| Role | Hex | CSS Variable |")
-    lines.append("|------|-----|--------------|")
-    lines.append(f"| Primary | `{colors.get('primary', '#2563EB')}` | `--color-primary` |")
-    lines.append(f"| Secondary | `{colors.get('secondary', '#3B82F6')}` | `--color-secondary` |")
-    lines.append(f"| CTA/Accent | `{colors.get('cta', '#F97316')}` | `--color-cta` |")
-    lines.append(f"| Background | `{colors.get('background', '#F8FAFC')}` | `--color-background` |")
-    lines.append(f"| Text | `{colors.get('text', '#1E293B')}` | `--color-text` |")
-    lines.append("")
-    if colors.get("notes"):
-        lines.append(f"**Color Notes:** {colors.get('notes', '')}")
-        lines.append("")
-    
-    # Typography
-    lines.append("### Typography")
-    lines.append("")
-    lines.append(f"- **Heading Font:** {typography.get('heading', 'Inter')}")
-    lines.append(f"- **Body Font:** {typography.get('body', 'Inter')}")
-    if typography.get("mood"):
-        lines.append(f"- **Mood:** {typography.get('mood', '')}")
-    if typography.get("google_fonts_url"):
-        lines.append(f"- **Google Fonts:** [{typography.get('heading', '')} + {typography.get('body', '')}]({typography.get('google_fonts_url', '')})")
-    lines.append("")
-    if typography.get("css_import"):
-        lines.append("**CSS Import:**")
-        lines.append("```css")
-        lines.append(typography.get("css_import", ""))
-        lines.append("```")
-        lines.append("")
-    
-    # Spacing Variables
-    lines.append("### Spacing Variables")
-    lines.append("")
-    lines.append("| Token | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--space-xs` | `4px` / `0.25rem` | Tight gaps |")
-    lines.append("| `--space-sm` | `8px` / `0.5rem` | Icon gaps, inline spacing |")
-    lines.append("| `--space-md` | `16px` / `1rem` | Standard padding |")
-    lines.append("| `--space-lg` | `24px` / `1.5rem` | Section padding |")
-    lines.append("| `--space-xl` | `32px` / `2rem` | Large gaps |")
-    lines.append("| `--space-2xl` | `48px` / `3rem` | Section margins |")
-    lines.append("| `--space-3xl` | `64px` / `4rem` | Hero padding |")
-    lines.append("")
-    
-    # Shadow Depths
-    lines.append("### Shadow Depths")
-    lines.append("")
-    lines.append("| Level | Value | Usage |")
-    lines.append("|-------|-------|-------|")
-    lines.append("| `--shadow-sm` | `0 1px 2px rgba(0,0,0,0.05)` | Subtle lift |")
-    lines.append("| `--shadow-md` | `0 4px 6px rgba(0,0,0,0.1)` | Cards, buttons |")
-    lines.append("| `--shadow-lg` | `0 10px 15px rgba(0,0,0,0.1)` | Modals, dropdowns |")
-    lines.append("| `--shadow-xl` | `0 20px 25px rgba(0,0,0,0.15)` | Hero images, featured cards |")
-    lines.append("")
-    
-    # Component Specs section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Component Specs")
-    lines.append("")
-    
-    # Buttons
-    lines.append("### Buttons")
-    lines.append("")
-    lines.append("```css")
-    lines.append("/* Primary Button */")
-    lines.append(".btn-primary {")
-    lines.append(f"  background: {colors.get('cta', '#F97316')};")
-    lines.append("  color: white;")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".btn-primary:hover {")
-    lines.append("  opacity: 0.9;")
-    lines.append("  transform: translateY(-1px);")
-    lines.append("}")
-    lines.append("")
-    lines.append("/* Secondary Button */")
-    lines.append(".btn-secondary {")
-    lines.append(f"  background: transparent;")
-    lines.append(f"  color: {colors.get('primary', '#2563EB')};")
-    lines.append(f"  border: 2px solid {colors.get('primary', '#2563EB')};")
-    lines.append("  padding: 12px 24px;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-weight: 600;")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Cards
-    lines.append("### Cards")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".card {")
-    lines.append(f"  background: {colors.get('background', '#FFFFFF')};")
-    lines.append("  border-radius: 12px;")
-    lines.append("  padding: 24px;")
-    lines.append("  box-shadow: var(--shadow-md);")
-    lines.append("  transition: all 200ms ease;")
-    lines.append("  cursor: pointer;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".card:hover {")
-    lines.append("  box-shadow: var(--shadow-lg);")
-    lines.append("  transform: translateY(-2px);")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Inputs
-    lines.append("### Inputs")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".input {")
-    lines.append("  padding: 12px 16px;")
-    lines.append("  border: 1px solid #E2E8F0;")
-    lines.append("  border-radius: 8px;")
-    lines.append("  font-size: 16px;")
-    lines.append("  transition: border-color 200ms ease;")
-    lines.append("}")
-    lines.append("")
-    lines.append(".input:focus {")
-    lines.append(f"  border-color: {colors.get('primary', '#2563EB')};")
-    lines.append("  outline: none;")
-    lines.append(f"  box-shadow: 0 0 0 3px {colors.get('primary', '#2563EB')}20;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Modals
-    lines.append("### Modals")
-    lines.append("")
-    lines.append("```css")
-    lines.append(".modal-overlay {")
-    lines.append("  background: rgba(0, 0, 0, 0.5);")
-    lines.append("  backdrop-filter: blur(4px);")
-    lines.append("}")
-    lines.append("")
-    lines.append(".modal {")
-    lines.append("  background: white;")
-    lines.append("  border-radius: 16px;")
-    lines.append("  padding: 32px;")
-    lines.append("  box-shadow: var(--shadow-xl);")
-    lines.append("  max-width: 500px;")
-    lines.append("  width: 90%;")
-    lines.append("}")
-    lines.append("```")
-    lines.append("")
-    
-    # Style section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Style Guidelines")
-    lines.append("")
-    lines.append(f"**Style:** {style.get('name', 'Minimalism')}")
-    lines.append("")
-    if style.get("keywords"):
-        lines.append(f"**Keywords:** {style.get('keywords', '')}")
-        lines.append("")
-    if style.get("best_for"):
-        lines.append(f"**Best For:** {style.get('best_for', '')}")
-        lines.append("")
-    if effects:
-        lines.append(f"**Key Effects:** {effects}")
-        lines.append("")
-    
-    # Layout Pattern
-    lines.append("### Page Pattern")
-    lines.append("")
-    lines.append(f"**Pattern Name:** {pattern.get('name', '')}")
-    lines.append("")
-    if pattern.get('conversion'):
-        lines.append(f"- **Conversion Strategy:** {pattern.get('conversion', '')}")
-    if pattern.get('cta_placement'):
-        lines.append(f"- **CTA Placement:** {pattern.get('cta_placement', '')}")
-    lines.append(f"- **Section Order:** {pattern.get('sections', '')}")
-    lines.append("")
-    
-    # Anti-Patterns section
-    lines.append("---")
-    lines.append("")
-    lines.append("## Anti-Patterns (Do NOT Use)")
-    lines.append("")
-    if anti_patterns:
-        anti_list = [a.strip() for a in anti_patterns.split("+")]
-        for anti in anti_list:
-            if anti:
-                lines.append(f"- ❌ {anti}")
-    lines.append("")
-    lines.append("### Additional Forbidden Patterns")
-    lines.append("")
-    lines.append("- ❌ **Emojis as icons** — Use SVG icons (Heroicons, Lucide, Simple Icons)")
-    lines.append("- ❌ **Missing cursor:pointer** — All clickable elements must have cursor:pointer")
-    lines.append("- ❌ **Layout-shifting hovers** — Avoid scale transforms that shift layout")
-    lines.append("- ❌ **Low contrast text** — Maintain 4.5:1 minimum contrast ratio")
-    lines.append("- ❌ **Instant state changes** — Always use transitions (150-300ms)")
-    lines.append("- ❌ **Invisible focus states** — Focus states must be visible for a11y")
-    lines.append("")
-    
-    # Pre-Delivery Checklist
-    lines.append("---")
-    lines.append("")
-    lines.append("## Pre-Delivery Checklist")
-    lines.append("")
-    lines.append("Before delivering any UI code, verify:")
-    lines.append("")
-    lines.append("- [ ] No emojis used as icons (use SVG instead)")
-    lines.append("- [ ] All icons from consistent icon set (Heroicons/Lucide)")
-    lines.append("- [ ] `cursor-pointer` on all clickable elements")
-    lines.append("- [ ] Hover states with smooth transitions (150-300ms)")
-    lines.append("- [ ] Light mode: text contrast 4.5:1 minimum")
-    lines.append("- [ ] Focus states visible for keyboard navigation")
-    lines.append("- [ ] `prefers-reduced-motion` respected")
-    lines.append("- [ ] Responsive: 375px, 768px, 1024px, 1440px")
-    lines.append("- [ ] No content hidden behind fixed navbars")
-    lines.append("- [ ] No horizontal scroll on mobile")
-    lines.append("")
-    
-    return "\n".join(lines)
+    context = _template_context(design_system)
+    anti_patterns = context["anti_patterns"]
+    anti_list = [a.strip() for a in anti_patterns.split("+")] if anti_patterns else []
+    return _MASTER.render(
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        category=design_system.get('category', 'General'),
+        anti_list=[anti for anti in anti_list if anti],
+        **context
+    )
+
+
+PAGE_OVERRIDE_TEMPLATE = """
+# {page_title} Page Overrides
+
+> **PROJECT:** {project}
+> **Generated:** {timestamp}
+> **Page Type:** {overrides.get('page_type', 'General')}
+
+> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).
+> Only deviations from the Master are documented here. For all other rules, refer to the Master.
+
+---
+
+## Page-Specific Rules
+
+### Layout Overrides
+
+% if overrides.get('layout'):
+%   for key, value in overrides['layout'].items():
+- **{key}:** {value}
+%   end
+% else:
+- No overrides — use Master layout
+% end
+
+### Spacing Overrides
+
+% if overrides.get('spacing'):
+%   for key, value in overrides['spacing'].items():
+- **{key}:** {value}
+%   end
+% else:
+- No overrides — use Master spacing
+% end
 
+### Typography Overrides
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+% if overrides.get('typography'):
+%   for key, value in overrides['typography'].items():
+- **{key}:** {value}
+%   end
+% else:
+- No overrides — use Master typography
+% end
+
+### Color Overrides
+
+% if overrides.get('colors'):
+%   for key, value in overrides['colors'].items():
+- **{key}:** {value}
+%   end
+% else:
+- No overrides — use Master colors
+% end
+
+### Component Overrides
+
+% if overrides.get('components', []):
+%   for comp in overrides['components']:
+- {comp}
+%   end
+% else:
+- No overrides — use Master component specs
+% end
+
+---
+
+## Page-Specific Components
+
+% if overrides.get('unique_components', []):
+%   for comp in overrides['unique_components']:
+- {comp}
+%   end
+% else:
+- No unique components for this page
+% end
+
+---
+
+## Recommendations
+
+% for rec in overrides.get('recommendations', []):
+- {rec}
+% end
+
+"""
+
+_PAGE_OVERRIDE = Template(PAGE_OVERRIDE_TEMPLATE, "project page_title timestamp overrides",
+                          namespace=_TEMPLATE_NAMESPACE, name="page_override")
+
+
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None,
+                            page_overrides: dict = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
-    project = design_system.get("project_name", "PROJECT")
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    page_title = page_name.replace("-", " ").replace("_", " ").title()
-    
-    # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
-    
-    lines = []
-    
-    lines.append(f"# {page_title} Page Overrides")
-    lines.append("")
-    lines.append(f"> **PROJECT:** {project}")
-    lines.append(f"> **Generated:** {timestamp}")
-    lines.append(f"> **Page Type:** {page_overrides.get('page_type', 'General')}")
-    lines.append("")
-    lines.append("> ⚠️ **IMPORTANT:** Rules in this file **override** the Master file (`design-system/MASTER.md`).")
-    lines.append("> Only deviations from the Master are documented here. For all other rules, refer to the Master.")
-    lines.append("")
-    lines.append("---")
-    lines.append("")
-    
-    # Page-specific rules with actual content
-    lines.append("## Page-Specific Rules")
-    lines.append("")
-    
-    # Layout Overrides
-    lines.append("### Layout Overrides")
-    lines.append("")
-    layout = page_overrides.get("layout", {})
-    if layout:
-        for key, value in layout.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master layout")
-    lines.append("")
-    
-    # Spacing Overrides
-    lines.append("### Spacing Overrides")
-    lines.append("")
-    spacing = page_overrides.get("spacing", {})
-    if spacing:
-        for key, value in spacing.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master spacing")
-    lines.append("")
-    
-    # Typography Overrides
-    lines.append("### Typography Overrides")
-    lines.append("")
-    typography = page_overrides.get("typography", {})
-    if typography:
-        for key, value in typography.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master typography")
-    lines.append("")
-    
-    # Color Overrides
-    lines.append("### Color Overrides")
-    lines.append("")
-    colors = page_overrides.get("colors", {})
-    if colors:
-        for key, value in colors.items():
-            lines.append(f"- **{key}:** {value}")
-    else:
-        lines.append("- No overrides — use Master colors")
-    lines.append("")
-    
-    # Component Overrides
-    lines.append("### Component Overrides")
-    lines.append("")
-    components = page_overrides.get("components", [])
-    if components:
-        for comp in components:
-            lines.append(f"- {comp}")
-    else:
-        lines.append("- No overrides — use Master component specs")
-    lines.append("")
-    
-    # Page-Specific Components
-    lines.append("---")
-    lines.append("")
-    lines.append("## Page-Specific Components")
-    lines.append("")
-    unique_components = page_overrides.get("unique_components", [])
-    if unique_components:
-        for comp in unique_components:
-            lines.append(f"- {comp}")
-    else:
-        lines.append("- No unique components for this page")
-    lines.append("")
-    
-    # Recommendations
-    lines.append("---")
-    lines.append("")
-    lines.append("## Recommendations")
-    lines.append("")
-    recommendations = page_overrides.get("recommendations", [])
-    if recommendations:
-        for rec in recommendations:
-            lines.append(f"- {rec}")
-    lines.append("")
-    
-    return "\n".join(lines)
+    # Detect page type and generate intelligent overrides (unless precomputed by _persist_pages)
+    if page_overrides is None:
+        page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    return _PAGE_OVERRIDE.render(
+        project=design_system.get("project_name", "PROJECT"),
+        page_title=page_name.replace("-", " ").replace("_", " ").title(),
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        overrides=page_overrides
+    )
 
 
 def _generate_intelligent_overrides(page_name: str, page_query: str, design_system: dict) -> dict:
@@ -918,16 +1092,23 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
-    
-    # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
+    return _build_overrides(page_name, page_query, *search_many(_override_searches(page_name, page_query)))
+
+
+def _override_searches(page_name: str, page_query: str) -> list:
+    """The (query, domain, max_results) searches behind one page's overrides."""
+    combined_context = f"{page_name.lower()} {(page_query or '').lower()}"
+    return [
+        (combined_context, "style", 1),
+        (combined_context, "ux", 3),
+        (combined_context, "landing", 1)
+    ]
+
+
+def _build_overrides(page_name: str, page_query: str, style_search: dict, ux_search: dict,
+                     landing_search: dict) -> dict:
+    """Turn one page's style / UX / landing search results into override sections."""
+    combined_context = f"{page_name.lower()} {(page_query or '').lower()}"
     
     # Extract results from search response
     style_results = style_search.get("results", [])
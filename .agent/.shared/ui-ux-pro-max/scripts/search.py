@@ -3,8 +3,12 @@
 """
 UI/UX Pro Max Search - BM25 search engine for UI/UX style guides
 Usage: python search.py "<query>" [--domain <domain>] [--stack <stack>] [--max-results 3]
+       python search.py "<query>" --stacks react,nextjs,shadcn   (or --stacks all)
        python search.py "<query>" --design-system [-p "Project Name"]
        python search.py "<query>" --design-system --persist [-p "Project Name"] [--page "dashboard"]
+       python search.py "<query>" --design-system --persist [-p "Project Name"] --pages dashboard,checkout,settings
+       python search.py --jsonl [--domain <domain> | --stack <stack> | --stacks ...] < queries.txt
+       python search.py --serve [--socket PATH]
 
 Domains: style, prompt, color, chart, landing, product, ux, typography
 Stacks: html-tailwind, react, nextjs
@@ -12,11 +16,23 @@ Stacks: html-tailwind, react, nextjs
 Persistence (Master + Overrides pattern):
   --persist    Save design system to design-system/MASTER.md
   --page       Also create a page-specific override file in design-system/pages/
+  --pages      Comma-separated pages: overrides are searched in one batch, then written
+
+Streaming (--jsonl):
+  Reads one query per stdin line and writes one compact JSON result per line
+  as each query completes; indexes are loaded once for the whole stream. A line
+  holding a JSON object is a daemon-protocol request ({"op": "stack", ...}).
+
+Daemon mode:
+  --serve      Keep all indexes in memory and answer queries over a Unix socket.
+               Domain/stack searches use a running daemon automatically (--no-daemon to skip).
 """
 
 import argparse
-from core import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS, search, search_stack
-from design_system import generate_design_system, persist_design_system
+import json
+import daemon
+from catalog import CSV_CONFIG, AVAILABLE_STACKS, MAX_RESULTS
+# core is imported only when no daemon answers, design_system only for --design-system
 
 
 def format_output(result):
@@ -45,13 +61,38 @@ def format_output(result):
     return "\n".join(output)
 
 
+def stream_jsonl(lines, out, domain=None, stack=None, stacks=None, max_results=MAX_RESULTS):
+    """Answer one query per input line with one compact JSON record per output line"""
+    from core import search, search_stack, search_stacks
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            if line.startswith("{"):
+                result = daemon.handle(json.loads(line))
+            elif stacks is not None:
+                result = search_stacks(line, stacks or None, max_results)
+            elif stack:
+                result = search_stack(line, stack, max_results)
+            else:
+                result = search(line, domain, max_results)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            result = {"error": f"Bad request: {e}", "line": line}
+        out.write(json.dumps(result, ensure_ascii=False, separators=(",", ":")) + "\n")
+        out.flush()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Pro Max Search")
-    parser.add_argument("query", help="Search query")
+    parser.add_argument("query", nargs="?", help="Search query")
     parser.add_argument("--domain", "-d", choices=list(CSV_CONFIG.keys()), help="Search domain")
     parser.add_argument("--stack", "-s", choices=AVAILABLE_STACKS, help="Stack-specific search (html-tailwind, react, nextjs)")
+    parser.add_argument("--stacks", type=str, default=None, help="Comma-separated stacks, or 'all', searched together with merged ranking")
     parser.add_argument("--max-results", "-n", type=int, default=MAX_RESULTS, help="Max results (default: 3)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
+    parser.add_argument("--jsonl", action="store_true", help="Read queries from stdin (one per line), stream one compact JSON result per line")
     # Design system generation
     parser.add_argument("--design-system", "-ds", action="store_true", help="Generate complete design system recommendation")
     parser.add_argument("--project-name", "-p", type=str, default=None, help="Project name for design system output")
@@ -59,48 +100,84 @@ if __name__ == "__main__":
     # Persistence (Master + Overrides pattern)
     parser.add_argument("--persist", action="store_true", help="Save design system to design-system/MASTER.md (creates hierarchical structure)")
     parser.add_argument("--page", type=str, default=None, help="Create page-specific override file in design-system/pages/")
+    parser.add_argument("--pages", type=str, default=None, help="Comma-separated page names, one override file each in design-system/pages/")
     parser.add_argument("--output-dir", "-o", type=str, default=None, help="Output directory for persisted files (default: current directory)")
+    # Daemon
+    parser.add_argument("--serve", action="store_true", help="Run the search daemon (Unix domain socket) in the foreground")
+    parser.add_argument("--socket", type=str, default=None, help="Daemon socket path (default: $UIPRO_SEARCH_SOCKET or a per-checkout temp path)")
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even if a daemon is running")
 
     args = parser.parse_args()
 
+    if args.serve:
+        daemon.serve(args.socket)
+        raise SystemExit(0)
+    if args.jsonl:
+        import sys
+        stacks = None
+        if args.stacks:
+            stacks = [] if args.stacks.strip() == "all" else [s.strip() for s in args.stacks.split(",") if s.strip()]
+        stream_jsonl(sys.stdin, sys.stdout, args.domain, args.stack, stacks, args.max_results)
+        raise SystemExit(0)
+    if args.query is None:
+        parser.error("the following arguments are required: query")
+
     # Design system takes priority
     if args.design_system:
-        result = generate_design_system(
-            args.query, 
-            args.project_name, 
-            args.format,
-            persist=args.persist,
-            page=args.page,
-            output_dir=args.output_dir
-        )
-        print(result)
+        from design_system import get_generator, persist_design_system, render_design_system
+        pages = [p.strip() for p in args.pages.split(",") if p.strip()] if args.pages else []
+        design_system = get_generator().generate(args.query, args.project_name)
+        persisted = None
+        if args.persist:
+            persisted = persist_design_system(design_system, args.page, args.output_dir, args.query, pages=pages)
+        print(render_design_system(design_system, args.format))
         
         # Print persistence confirmation
-        if args.persist:
+        if persisted:
             project_slug = args.project_name.lower().replace(' ', '-') if args.project_name else "default"
             print("\n" + "=" * 60)
             print(f"✅ Design system persisted to design-system/{project_slug}/")
             print(f"   📄 design-system/{project_slug}/MASTER.md (Global Source of Truth)")
-            if args.page:
-                page_filename = args.page.lower().replace(' ', '-')
+            page_filenames = dict.fromkeys(p.lower().replace(' ', '-') for p in ([args.page] if args.page else []) + pages)
+            for page_filename in page_filenames:
                 print(f"   📄 design-system/{project_slug}/pages/{page_filename}.md (Page Overrides)")
+            if persisted["skipped"]:
+                print(f"   ⏭️  {persisted['skipped']} of {len(persisted['created_files'])} files unchanged, not rewritten")
             print("")
             print(f"📖 Usage: When building a page, check design-system/{project_slug}/pages/[page].md first.")
             print(f"   If exists, its rules override MASTER.md. Otherwise, use MASTER.md.")
             print("=" * 60)
+    # Cross-stack search
+    elif args.stacks:
+        stacks = None if args.stacks.strip() == "all" else [s.strip() for s in args.stacks.split(",") if s.strip()]
+        result = None if args.no_daemon else daemon.request(
+            {"op": "stacks", "query": args.query, "stacks": stacks, "max_results": args.max_results}, args.socket)
+        if result is None:
+            from core import search_stacks
+            result = search_stacks(args.query, stacks, args.max_results)
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            print(format_output(result))
     # Stack search
     elif args.stack:
-        result = search_stack(args.query, args.stack, args.max_results)
+        result = None if args.no_daemon else daemon.request(
+            {"op": "stack", "query": args.query, "stack": args.stack, "max_results": args.max_results}, args.socket)
+        if result is None:
+            from core import search_stack
+            result = search_stack(args.query, args.stack, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
     # Domain search
     else:
-        result = search(args.query, args.domain, args.max_results)
+        result = None if args.no_daemon else daemon.request(
+            {"op": "search", "query": args.query, "domain": args.domain, "max_results": args.max_results}, args.socket)
+        if result is None:
+            from core import search
+            result = search(args.query, args.domain, args.max_results)
         if args.json:
-            import json
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
             print(format_output(result))
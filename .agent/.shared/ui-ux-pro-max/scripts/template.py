@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled line templates for the design-system formatters (design_system.py).
+
+A template is parsed once, on first render, into a Python function that
+appends a handful of prebuilt chunks and returns them with a single
+"\\n".join().
+
+Syntax (one output line per text line):
+  % if <expr>:  / % elif <expr>:  / % else:  / % for <target> in <expr>:  / % end
+  %% at the start of a line       literal %
+  {expr}, {expr:spec}, {{ and }}  as in f-strings (expressions may not use backslashes)
+
+With box=N, a text line ending in "|" is left-justified to N columns before
+that closing "|" (ASCII box borders). Static lines are padded at compile time.
+
+A leading newline right after the opening quotes is ignored, and so is the
+final newline, so a template ending in an empty line renders a trailing "\\n".
+"""
+
+import re
+
+_CONTROL = re.compile(r"%\s*(if|elif|else|for|end)\b(.*)$")
+
+
+def _is_static(line):
+    """True when a text line has no {expr} placeholders (only {{ / }} escapes)"""
+    rest = line.replace("{{", "").replace("}}", "")
+    return "{" not in rest and "}" not in rest
+
+
+def _unescape(line):
+    return line.replace("{{", "{").replace("}}", "}")
+
+
+def _literal(text, dynamic):
+    """Python source for text as a raw (f-)string literal"""
+    for quote in ('"""', "'''"):
+        if quote not in text and not text.endswith(quote[0]):
+            return f"{'rf' if dynamic else 'r'}{quote}{text}{quote}"
+    raise ValueError(f"Template line can't be compiled (mixed quotes): {text!r}")
+
+
+class Template:
+    """A line template compiled to a function; render(**context) -> str"""
+
+    def __init__(self, source, params, box=None, namespace=None, name="template"):
+        """
+        params: names the template expressions use, passed to render() by keyword
+        namespace: module-level names (helpers, constants) visible to expressions
+        """
+        self.name = name
+        self.source = source
+        self.params = params.split() if isinstance(params, str) else list(params)
+        self.box = box
+        self.namespace = namespace
+        self.code = None
+        self._render = None
+
+    def render(self, **context):
+        if self._render is None:
+            # Compiled on first use: importing design_system for one format shouldn't build all four
+            self.code = self._compile(self.source)
+            scope = dict(self.namespace or {})
+            exec(compile(self.code, f"<{self.name}>", "exec"), scope)
+            self._render = scope["_render"]
+        return self._render(**context)
+
+    def _compile(self, source):
+        if source.startswith("\n"):
+            source = source[1:]
+        if source.endswith("\n"):
+            source = source[:-1]
+
+        code = [f"def _render(*, {', '.join(self.params)}):", "    _out = []", "    _a = _out.append"]
+        depth = 1
+        pending = []   # Consecutive text lines, emitted as one chunk
+        filled = [True]  # Whether each open block has a statement yet
+
+        def emit(statement):
+            code.append("    " * depth + statement)
+            filled[-1] = True
+
+        def flush():
+            run = []
+            for line in pending + [None]:
+                if line is not None and not (self.box and line.endswith("|") and not _is_static(line)):
+                    if self.box and line.endswith("|"):
+                        line = _unescape(line[:-1]).ljust(self.box) + "|"
+                        line = line.replace("{", "{{").replace("}", "}}")
+                    run.append(line)
+                    continue
+                if run:
+                    text = "\n".join(run)
+                    dynamic = not _is_static(text)
+                    emit(f"_a({_literal(text if dynamic else _unescape(text), dynamic)})")
+                    run = []
+                if line is not None:
+                    emit(f"_a({_literal(line[:-1], True)}.ljust({self.box}) + '|')")
+            pending.clear()
+
+        for number, line in enumerate(source.split("\n"), 1):
+            stripped = line.lstrip()
+            if not stripped.startswith("%") or stripped.startswith("%%"):
+                pending.append(line.replace("%%", "%", 1) if stripped.startswith("%%") else line)
+                continue
+            match = _CONTROL.match(stripped)
+            if not match:
+                raise ValueError(f"{self.name}:{number}: unknown directive {stripped!r}")
+            flush()
+            keyword, rest = match.group(1), match.group(2).strip()
+            if keyword in ("elif", "else", "end"):
+                if depth == 1:
+                    raise ValueError(f"{self.name}:{number}: '% {keyword}' without an open block")
+                if not filled.pop():
+                    code.append("    " * depth + "pass")
+                depth -= 1
+                if keyword == "end":
+                    continue
+            emit(f"{keyword} {rest}" if rest else f"{keyword}:")
+            depth += 1
+            filled.append(False)
+        flush()
+        if depth != 1:
+            raise ValueError(f"{self.name}: {depth - 1} block(s) missing '% end'")
+        code.append('    return "\\n".join(_out)')
+        return "\n".join(code) + "\n"
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for core.py's BM25 index
+Usage: python -m unittest discover .agent/.shared/ui-ux-pro-max/tests   (or pytest)
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import core
+from core import BM25
+
+
+class EmptyCorpusTest(unittest.TestCase):
+    """Documents that tokenize to nothing (every word under 3 characters)"""
+
+    DOCUMENTS = ["UI", "a b"]
+
+    def test_fit(self):
+        for backend in ("python", "numpy"):
+            bm25 = BM25(backend=backend)
+            bm25.fit(self.DOCUMENTS)
+            self.assertEqual(bm25.N, 2)
+            self.assertEqual(bm25.score("ui"), [])
+
+    def test_fit_fields(self):
+        bm25 = BM25(field_weights=[2.0, 1.0])
+        bm25.fit_fields([[doc, ""] for doc in self.DOCUMENTS])
+        self.assertEqual(bm25.score("ui"), [])
+
+    def test_splice_to_empty(self):
+        bm25 = BM25()
+        bm25.fit(["alpha beta", "gamma"])
+        self.assertTrue(bm25.splice(0, 2, ["alpha beta", "gamma"], self.DOCUMENTS))
+        self.assertEqual(bm25.score("alpha"), [])
+        bm25.splice(2, 2, [], ["alpha"])
+        self.assertEqual([idx for idx, _ in bm25.score("alpha")], [2])
+
+
+class SpliceFieldsTest(unittest.TestCase):
+    """A spliced BM25F index scores exactly like one fitted from scratch"""
+
+    CORPUS = [["minimal dark", "clean layout grid"], ["glass blur", "frosted panel"],
+              ["brutal raw", "bold grid type"], ["soft neumorphic", "shadow panel layout"]]
+
+    def assertSameScores(self, spliced, corpus):
+        fresh = BM25(field_weights=[2.0, 1.0])
+        fresh.fit_fields(corpus)
+        for query in ("grid", "panel layout", "glass dark bold"):
+            self.assertEqual(spliced.score(query), fresh.score(query))
+
+    def test_append(self):
+        bm25 = BM25(field_weights=[2.0, 1.0])
+        bm25.fit_fields(self.CORPUS)
+        new = [["retro neon glow", ""], ["synthwave", "neon grid"]]
+        # The field averages move, so splice() refuses and leaves the index as it was
+        self.assertFalse(bm25.splice(4, 4, [], new))
+        self.assertSameScores(bm25, self.CORPUS)
+
+    def test_replace_same_lengths(self):
+        bm25 = BM25(field_weights=[2.0, 1.0])
+        bm25.fit_fields(self.CORPUS)
+        new = [["glass dark", "frosted grid"]]
+        self.assertTrue(bm25.splice(1, 2, self.CORPUS[1:2], new))
+        self.assertSameScores(bm25, self.CORPUS[:1] + new + self.CORPUS[2:])
+
+
+class ResultCacheTest(unittest.TestCase):
+    """A persisted results.json is not reused after a catalog edit"""
+
+    def setUp(self):
+        self.saved = core.INDEX_DIR, dict(core.RESULT_CACHE_CONFIG), core.CSV_CONFIG["style"]
+        core.INDEX_DIR = Path(tempfile.mkdtemp())
+        core.RESULT_CACHE_CONFIG["persist"] = True
+        core._RESULT_CACHE = None
+
+    def tearDown(self):
+        shutil.rmtree(core.INDEX_DIR, ignore_errors=True)
+        core.INDEX_DIR, config, core.CSV_CONFIG["style"] = self.saved
+        core.RESULT_CACHE_CONFIG.update(config)
+        core._RESULT_CACHE = None
+        core.clear_index_cache()
+
+    def test_output_cols_edit(self):
+        core.search("glassmorphism", "style")
+        core._result_cache().save()
+        core._RESULT_CACHE = None  # As in a new process
+        config = dict(core.CSV_CONFIG["style"], output_cols=["Style Category"])
+        core.CSV_CONFIG["style"] = config
+        results = core.search("glassmorphism", "style")["results"]
+        self.assertTrue(results)
+        self.assertEqual([list(row) for row in results], [["Style Category"]] * len(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
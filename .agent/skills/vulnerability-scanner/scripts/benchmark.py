@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Skill: vulnerability-scanner
+Script: benchmark.py
+Purpose: Throughput measurements for security_scan.py's scanners
+Usage: python benchmark.py [<benchmark> ...] [--root PROJECT] [--repeat 5]
+
+Benchmarks:
+  secrets   scan_secrets matching throughput (MB/s): one re.findall per SECRET_PATTERNS entry
+            vs the anchored SecretMatcher, over includes/, assets/js/admin.js and data/*.json
+  patterns  scan_code_patterns wall time: re.search per line per DANGEROUS_PATTERNS entry vs
+            find_code_patterns (one finditer per pattern + newline offset table), same targets
+  walk      secrets + patterns + config over the whole project: one walk and read per scan
+            vs load_project_files' single shared walk (files opened, MB read, wall time)
+  scaling   load_project_files wall time at --jobs 1/2/4/8 on a generated tree of --files
+            source files (default 10000), checking every worker count gives the same findings
+"""
+import argparse
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from security_scan import (CODE_EXTENSIONS, CONFIG_EXTENSIONS, DANGEROUS_PATTERNS, FILE_SCANS, SECRET_MATCHER,
+                           SECRET_PATTERNS, default_jobs, find_code_patterns, iter_project_files, load_project_files,
+                           scan_code_patterns, scan_configuration, scan_secrets)
+
+
+# ============================================================================
+#  HELPERS
+# ============================================================================
+
+def _timed(fn, repeat=1):
+    """Run fn `repeat` times, return (mean seconds, last result)"""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def _read(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def _corpus(root: Path) -> Dict:
+    """{label: [paths]} for the benchmark targets that exist under root"""
+    groups = {
+        "includes/": sorted(p for p in (root / "includes").rglob("*")
+                            if p.is_file() and p.suffix.lower() in CODE_EXTENSIONS | CONFIG_EXTENSIONS),
+        "assets/js/admin.js": [root / "assets" / "js" / "admin.js"],
+        "data/*.json": sorted((root / "data").glob("*.json")),
+    }
+    return {label: [p for p in paths if p.is_file()] for label, paths in groups.items()}
+
+
+# ============================================================================
+#  BENCHMARKS
+# ============================================================================
+
+def _legacy_secrets(content: str) -> list:
+    """scan_secrets' matching as it was before SecretMatcher"""
+    found = []
+    for pattern, secret_type, severity in SECRET_PATTERNS:
+        matches = re.findall(pattern, content, re.IGNORECASE)
+        if matches:
+            found.append((secret_type, severity, len(matches)))
+    return found
+
+
+def bench_secrets(root: Path, repeat: int):
+    """MB/s of secret matching per target group, legacy per-pattern findall vs SecretMatcher."""
+    print("## Secrets: matching throughput (file contents preloaded)")
+    print(f"{'target':<22}{'files':>7}{'MB':>8}{'findall MB/s':>15}{'matcher MB/s':>15}{'speedup':>9}")
+    for label, paths in _corpus(root).items():
+        if not paths:
+            print(f"{label:<22}{'(missing)':>7}")
+            continue
+        contents = [_read(p) for p in paths]
+        megabytes = sum(len(c.encode('utf-8')) for c in contents) / 1e6
+        legacy, expected = _timed(lambda: [_legacy_secrets(c) for c in contents], repeat)
+        engine, found = _timed(lambda: [SECRET_MATCHER.scan(c) for c in contents], repeat)
+        if found != expected:
+            raise SystemExit(f"secrets: SecretMatcher disagrees with re.findall on {label}")
+        print(f"{label:<22}{len(paths):>7}{megabytes:>8.2f}{megabytes / legacy:>15.1f}"
+              f"{megabytes / engine:>15.1f}{legacy / engine:>8.1f}x")
+    print("")
+
+
+def _legacy_patterns(content: str) -> list:
+    """scan_code_patterns' matching as it was before find_code_patterns (readlines + re.search)"""
+    found = []
+    for line_num, line in enumerate(io.StringIO(content).readlines(), 1):
+        for pattern, name, severity, category in DANGEROUS_PATTERNS:
+            if re.search(pattern, line, re.IGNORECASE):
+                found.append((line_num, line.strip()[:80], name, severity, category))
+    return found
+
+
+def bench_patterns(root: Path, repeat: int):
+    """Wall time of dangerous-pattern matching per target group, per-line re.search vs find_code_patterns."""
+    print("## Patterns: per-line re.search vs whole-file finditer (file contents preloaded)")
+    print(f"{'target':<22}{'files':>7}{'lines':>9}{'per-line ms':>13}{'whole-file ms':>15}{'speedup':>9}")
+    for label, paths in _corpus(root).items():
+        paths = [p for p in paths if p.suffix.lower() in CODE_EXTENSIONS]
+        if not paths:
+            print(f"{label:<22}{'(no code)':>7}")
+            continue
+        contents = [_read(p) for p in paths]
+        lines = sum(c.count("\n") + 1 for c in contents)
+        legacy, expected = _timed(lambda: [_legacy_patterns(c) for c in contents], repeat)
+        engine, found = _timed(lambda: [[(n, line.strip()[:80], *rest) for n, line, *rest in find_code_patterns(c)]
+                                        for c in contents], repeat)
+        if found != expected:
+            raise SystemExit(f"patterns: find_code_patterns disagrees with per-line re.search on {label}")
+        print(f"{label:<22}{len(paths):>7}{lines:>9}{legacy * 1000:>13.1f}{engine * 1000:>15.1f}"
+              f"{legacy / engine:>8.1f}x")
+    print("")
+
+
+def bench_walk(root: Path, repeat: int):
+    """I/O and wall time of the three content scans, each walking on its own vs one shared load."""
+    print("## Walk: separate scans vs one shared file load (secrets + patterns + config)")
+    files = list(iter_project_files(str(root), FILE_SCANS))
+    sizes = {path: path.stat().st_size for path, _ in files}
+    separate_reads = sum(len(scans) for _, scans in files)
+    separate_mb = sum(sizes[path] * len(scans) for path, scans in files) / 1e6
+    shared_mb = sum(sizes.values()) / 1e6
+
+    def separate():
+        return [scan(str(root)) for scan in (scan_secrets, scan_code_patterns, scan_configuration)]
+
+    def shared():
+        loaded = load_project_files(str(root), FILE_SCANS)
+        return [scan(str(root), loaded) for scan in (scan_secrets, scan_code_patterns, scan_configuration)]
+
+    legacy, expected = _timed(separate, repeat)
+    engine, found = _timed(shared, repeat)
+    if found != expected:
+        raise SystemExit("walk: shared load disagrees with separate scans")
+    print(f"{'':<10}{'walks':>7}{'opens':>8}{'MB read':>10}{'wall ms':>10}")
+    print(f"{'separate':<10}{3:>7}{separate_reads:>8}{separate_mb:>10.2f}{legacy * 1000:>10.1f}")
+    print(f"{'shared':<10}{1:>7}{len(files):>8}{shared_mb:>10.2f}{engine * 1000:>10.1f}")
+    print(f"I/O {separate_mb / shared_mb:.1f}x less, wall time {legacy / engine:.2f}x (page cache warm)")
+    print("")
+
+
+# Lines the synthetic tree is assembled from: mostly ordinary code, with a few findings
+_FILLER = [
+    "def handler(request, response):",
+    "    value = compute(request.args.get('limit', 10)) + offset",
+    "    for item in items: total += item.price * item.quantity",
+    "const state = useState({ open: false, items: [] });",
+    "$query = $wpdb->prepare( 'SELECT id FROM table WHERE slug = %s', $slug );",
+    "    return render_template('index.html', user=user, rows=rows)",
+    "// Normalise the incoming payload before validation",
+    "    if (!current_user_can('manage_options')) { wp_die(); }",
+]
+_FINDINGS = [
+    "result = eval(user_input)",
+    "el.innerHTML = html;",
+    "requests.get(url, verify=False)",
+    "api_key = 'abcdefghijklmnop1234'",
+    "password: 'hunter22'",
+    "data = pickle.loads(blob)",
+    "conn = 'postgres://user:pw@db/app'",
+]
+
+
+def _synthetic_tree(root: Path, files: int, seed: int = 1):
+    """Write `files` source files (.py/.js/.php/.json, ~3 KB each) under root"""
+    rng = random.Random(seed)
+    extensions = [".py", ".js", ".php", ".json"]
+    for i in range(files):
+        directory = root / f"pkg{i % 50:02d}" / f"mod{i % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        lines = [rng.choice(_FINDINGS) if rng.random() < 0.01 else rng.choice(_FILLER)
+                 for _ in range(rng.randint(20, 100))]
+        (directory / f"file{i:05d}{extensions[i % 4]}").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def bench_scaling(root: Path, repeat: int, files: int = 10000):
+    """load_project_files wall time by worker count on a generated tree."""
+    print(f"## Scaling: --jobs on a synthetic tree of {files} files (CPU cores here: {default_jobs()})")
+    with tempfile.TemporaryDirectory(prefix="security-scan-bench-") as tmp:
+        _synthetic_tree(Path(tmp), files)
+        megabytes = sum(p.stat().st_size for p in Path(tmp).rglob("*") if p.is_file()) / 1e6
+        print(f"{megabytes:.1f} MB generated")
+        print(f"{'jobs':>6}{'wall ms':>10}{'files/s':>10}{'speedup':>9}")
+        baseline = expected = None
+        for jobs in (1, 2, 4, 8):
+            elapsed, found = _timed(lambda: load_project_files(tmp, FILE_SCANS, jobs), repeat)
+            if expected is None:
+                baseline, expected = elapsed, found
+            elif found != expected:
+                raise SystemExit(f"scaling: --jobs {jobs} disagrees with --jobs 1")
+            print(f"{jobs:>6}{elapsed * 1000:>10.0f}{files / elapsed:>10.0f}{baseline / elapsed:>8.2f}x")
+    print("")
+
+
+BENCHMARKS = {
+    "secrets": bench_secrets,
+    "patterns": bench_patterns,
+    "walk": bench_walk,
+    "scaling": bench_scaling,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark security_scan.py")
+    parser.add_argument("benchmarks", nargs="*", metavar="benchmark",
+                        help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument("--root", default=".", help="Project directory holding the benchmark targets")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Repetitions per measurement (default: 5)")
+    parser.add_argument("--files", type=int, default=10000, help="Synthetic tree size for scaling (default: 10000)")
+    args = parser.parse_args()
+    benchmarks = dict(BENCHMARKS, scaling=partial(bench_scaling, files=args.files))
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.benchmarks or benchmarks:
+        benchmarks[name](Path(args.root), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
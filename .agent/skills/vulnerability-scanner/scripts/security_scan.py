@@ -3,7 +3,7 @@
 Skill: vulnerability-scanner
 Script: security_scan.py
 Purpose: Validate that security principles from SKILL.md are applied correctly
-Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config]
+Usage: python security_scan.py <project_path> [--scan-type all|deps|secrets|patterns|config] [--jobs N] [--no-cache]
 Output: JSON with validation findings
 
 This script verifies:
@@ -18,8 +18,11 @@ import os
 import sys
 import re
 import argparse
+import hashlib
+import time
+from bisect import bisect_right
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, Tuple
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -58,6 +61,24 @@ SECRET_PATTERNS = [
     (r'eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+', "JWT Token", "high"),
 ]
 
+# Lowercase literals that every match of a SECRET_PATTERNS entry starts with.
+# Patterns are only tried where one of their literals occurs; a type missing
+# here is searched for across the whole file.
+SECRET_ANCHORS = {
+    "API Key": ("api",),
+    "Token": ("token",),
+    "Bearer Token": ("bearer",),
+    "AWS Access Key": ("akia",),
+    "AWS Secret": ("aws",),
+    "Azure Credential": ("azure",),
+    "GCP Credential": ("google",),
+    "Password": ("password",),
+    "Database Connection String": ("mongodb", "postgres", "mysql", "redis"),
+    "Private Key": ("-----begin",),
+    "SSH Key": ("ssh-rsa",),
+    "JWT Token": ("eyj",),
+}
+
 DANGEROUS_PATTERNS = [
     # Injection risks
     (r'eval\s*\(', "eval() usage", "critical", "Code Injection risk"),
@@ -85,9 +106,394 @@ DANGEROUS_PATTERNS = [
     (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
 ]
 
+CONFIG_ISSUES = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
 SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
+CONFIG_FILENAMES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+
+# Scans that read file contents; run_full_scan loads each file once for all of them
+FILE_SCANS = ("secrets", "patterns", "config")
+
+# --jobs: files handed to a worker process per task, and tasks aimed for per worker;
+# fewer than two MIN_CHUNK_FILES chunks of work are scanned in-process
+CHUNK_FILES = 64
+MIN_CHUNK_FILES = 16
+CHUNKS_PER_JOB = 4
+
+# Per-file findings kept between runs (relative to the project); --no-cache skips it.
+# Bump CACHE_VERSION when the findings format changes - rule edits are picked up by hash.
+CACHE_FILE = Path(".agent") / "security_scan.cache"
+CACHE_VERSION = 1
+CACHE_RACY_NS = 2 * 10**9  # Files modified this close to a run are re-hashed next time, not trusted by mtime
+
+
+# ============================================================================
+#  SECRET MATCHING ENGINE
+# ============================================================================
+
+# Non-ASCII letters that re.IGNORECASE matches to an ASCII one but str.lower() leaves alone
+_CASE_TRAPS = re.compile('[\u0131\u017f]')
+
+
+class SecretMatcher:
+    """
+    Counts every SECRET_PATTERNS type in one read of a file's content.
+
+    The content is lowercased once and each anchor literal located with
+    str.find(); a pattern is then only tried, via .match(), at the start
+    positions of its own literals. Skipping positions inside the previous
+    match gives exactly re.findall()'s non-overlapping count, without
+    re-scanning the whole text with every IGNORECASE pattern.
+    """
+
+    def __init__(self, patterns, anchors):
+        self.rules = [(re.compile(pattern, re.IGNORECASE), secret_type, severity, anchors.get(secret_type))
+                      for pattern, secret_type, severity in patterns]
+        self.literals = sorted({literal for *_, literals in self.rules if literals for literal in literals})
+
+    def scan(self, content: str) -> List[tuple]:
+        """(secret_type, severity, count) for each pattern found, in SECRET_PATTERNS order"""
+        lowered = content.lower()
+        if len(lowered) != len(content) or (not content.isascii() and _CASE_TRAPS.search(content)):
+            # Lowercasing moved offsets or would hide a match: plain findall per pattern
+            return [(secret_type, severity, count) for rx, secret_type, severity, _ in self.rules
+                    for count in [len(rx.findall(content))] if count]
+
+        positions = {}
+        for literal in self.literals:
+            hits = []
+            i = lowered.find(literal)
+            while i != -1:
+                hits.append(i)
+                i = lowered.find(literal, i + 1)
+            if hits:
+                positions[literal] = hits
+
+        found = []
+        for rx, secret_type, severity, literals in self.rules:
+            if literals is None:
+                count = len(rx.findall(content))
+            else:
+                starts = [pos for literal in literals for pos in positions.get(literal, ())]
+                if len(literals) > 1:
+                    starts.sort()
+                count = end = 0
+                for pos in starts:
+                    if pos < end:
+                        continue
+                    match = rx.match(content, pos)
+                    if match:
+                        count += 1
+                        end = match.end()
+            if count:
+                found.append((secret_type, severity, count))
+        return found
+
+
+SECRET_MATCHER = SecretMatcher(SECRET_PATTERNS, SECRET_ANCHORS)
+
+
+# ============================================================================
+#  CODE PATTERN MATCHING
+# ============================================================================
+
+def _single_line(pattern: str) -> str:
+    """
+    Rewrite a per-line pattern so it can run over a whole file without
+    matching across a newline: negated classes and \\s (used outside
+    character classes in DANGEROUS_PATTERNS) no longer accept "\\n".
+    """
+    return pattern.replace('[^', r'[^\n').replace(r'\s', r'[^\S\n]')
+
+
+CODE_PATTERN_RULES = [(re.compile(_single_line(pattern), re.IGNORECASE), name, severity, category)
+                      for pattern, name, severity, category in DANGEROUS_PATTERNS]
+
+
+def find_code_patterns(content: str) -> List[tuple]:
+    """
+    (line number, line, name, severity, category) for each line matching a
+    DANGEROUS_PATTERNS entry, ordered by line then pattern - what a
+    re.search per line per pattern reports, from one finditer per pattern.
+    """
+    hits = {}
+    line_starts = None
+    for index, (rx, name, severity, category) in enumerate(CODE_PATTERN_RULES):
+        for match in rx.finditer(content):
+            if line_starts is None:
+                # Offset of every line's first character, built on the first match only
+                line_starts = [0]
+                pos = content.find("\n")
+                while pos != -1:
+                    line_starts.append(pos + 1)
+                    pos = content.find("\n", pos + 1)
+            line = bisect_right(line_starts, match.start())
+            hits.setdefault((line, index), (name, severity, category))
+
+    found = []
+    for (line, _), (name, severity, category) in sorted(hits.items()):
+        end = line_starts[line] if line < len(line_starts) else len(content)
+        found.append((line, content[line_starts[line - 1]:end], name, severity, category))
+    return found
+
+
+# ============================================================================
+#  FINDINGS CACHE
+# ============================================================================
+
+# Identifies the rules a cached finding came from; any change to them invalidates the whole cache
+RULESET_VERSION = hashlib.sha1(json.dumps(
+    [CACHE_VERSION, SECRET_PATTERNS, SECRET_ANCHORS, DANGEROUS_PATTERNS, CONFIG_ISSUES]).encode('utf-8')).hexdigest()
+
+
+class ScanCache:
+    """
+    Per-file findings persisted between runs as JSON, so a rerun only
+    scans files that changed.
+
+    Entries are keyed by relative path and hold the file's size, mtime,
+    SHA-1 and {scan: findings}. A file whose size and mtime still match is
+    served without being read; one whose stat changed but whose content
+    hash didn't is read and hashed, but not scanned again. The cache is
+    discarded when RULESET_VERSION differs.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._seen = set()
+        self._dirty = False
+        self._started_ns = time.time_ns()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get("version") == RULESET_VERSION:
+                self._entries = state.get("files", {})
+            else:
+                self._dirty = True
+        except (OSError, ValueError, AttributeError):
+            self._dirty = path.exists()
+
+    def lookup(self, relpath: str, stat: os.stat_result, scans: List[str]) -> Dict[str, List[Dict]]:
+        """Cached {scan: findings} when the file's size and mtime are unchanged, else None"""
+        self._seen.add(relpath)
+        entry = self._entries.get(relpath)
+        if (entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size
+                or any(scan not in entry["scans"] for scan in scans)):
+            return None
+        self.hits += 1
+        return {scan: entry["scans"][scan] for scan in scans}
+
+    def digest(self, relpath: str, scans: List[str]) -> str:
+        """SHA-1 of the cached entry's content if it covers `scans`, else None"""
+        entry = self._entries.get(relpath)
+        if entry is None or any(scan not in entry["scans"] for scan in scans):
+            return None
+        return entry["sha1"]
+
+    def reuse(self, relpath: str, stat: os.stat_result, scans: List[str]) -> Dict[str, List[Dict]]:
+        """Cached findings for a file whose content hash matched digest(); refreshes its stat"""
+        self.hits += 1
+        entry = self._entries[relpath]
+        entry["size"], entry["mtime_ns"] = stat.st_size, self._trusted_mtime(stat)
+        self._dirty = True
+        return {scan: entry["scans"][scan] for scan in scans}
+
+    def store(self, relpath: str, stat: os.stat_result, sha1: str, found: Dict[str, List[Dict]]):
+        self.misses += 1
+        if sha1 is None:
+            return
+        entry = self._entries.get(relpath)
+        scans = dict(entry["scans"]) if entry is not None and entry["sha1"] == sha1 else {}
+        scans.update(found)
+        self._entries[relpath] = {"size": stat.st_size, "mtime_ns": self._trusted_mtime(stat),
+                                  "sha1": sha1, "scans": scans}
+        self._dirty = True
+
+    def _trusted_mtime(self, stat: os.stat_result) -> int:
+        """The mtime to match next run, or None (always re-hash) for a file modified during this one"""
+        return stat.st_mtime_ns if stat.st_mtime_ns < self._started_ns - CACHE_RACY_NS else None
+
+    def save(self, prune: bool = False):
+        """
+        Write the cache atomically if anything changed; failures (read-only
+        checkouts) are ignored. prune drops entries for files this run didn't visit.
+        """
+        if prune and len(self._seen) != len(self._entries):
+            self._entries = {relpath: entry for relpath, entry in self._entries.items() if relpath in self._seen}
+            self._dirty = True
+        if not self._dirty:
+            return
+        import tempfile
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({"version": RULESET_VERSION, "files": self._entries},
+                                   ensure_ascii=False, separators=(",", ":")))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {"path": str(self.path), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0}
+
+
+# ============================================================================
+#  FILE LOADING
+# ============================================================================
+
+def file_scans(filename: str) -> List[str]:
+    """The FILE_SCANS that read a file, decided by its name and extension"""
+    ext = Path(filename).suffix.lower()
+    scans = []
+    if ext in CODE_EXTENSIONS or ext in CONFIG_EXTENSIONS:
+        scans.append("secrets")
+    if ext in CODE_EXTENSIONS:
+        scans.append("patterns")
+    if ext in CONFIG_EXTENSIONS or filename in CONFIG_FILENAMES:
+        scans.append("config")
+    return scans
+
+
+def iter_project_files(project_path: str, scans: List[str]) -> Iterator[Tuple[Path, List[str]]]:
+    """(path, [scans]) for every file under project_path that one of `scans` reads, in os.walk order"""
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        
+        for file in files:
+            wanted = [scan for scan in file_scans(file) if scan in scans]
+            if wanted:
+                yield Path(root) / file, wanted
+
+
+def scan_file_content(relpath: str, content: str, scans: List[str]) -> Dict[str, List[Dict]]:
+    """{scan: findings} for one file's content, for each of `scans`"""
+    found = {}
+    if "secrets" in scans:
+        found["secrets"] = [{"file": relpath, "type": secret_type, "severity": severity, "count": count}
+                            for secret_type, severity, count in SECRET_MATCHER.scan(content)]
+    if "patterns" in scans:
+        found["patterns"] = [{"file": relpath, "line": line_num, "pattern": name, "severity": severity,
+                              "category": category, "snippet": line.strip()[:80]}
+                             for line_num, line, name, severity, category in find_code_patterns(content)]
+    if "config" in scans:
+        found["config"] = [{"file": relpath, "issue": issue, "severity": severity}
+                           for pattern, issue, severity in CONFIG_ISSUES
+                           if re.search(pattern, content, re.IGNORECASE)]
+    return found
+
+
+def _scan_file(project_path: str, filepath: Path, scans: List[str], known_sha1: str = None) -> Tuple[str, Dict]:
+    """
+    (content SHA-1, scan_file_content()) for one file on disk. The findings
+    are None when the hash equals known_sha1 (the cached ones still hold),
+    and the result is (None, {}) when the file can't be read.
+    """
+    try:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        
+        sha1 = hashlib.sha1(content.encode('utf-8')).hexdigest()
+        if sha1 == known_sha1:
+            return sha1, None
+        return sha1, scan_file_content(str(filepath.relative_to(project_path)), content, scans)
+    except Exception:
+        return None, {}
+
+
+def _scan_chunk(project_path: str, chunk: List[Tuple[Path, List[str], str]]) -> List[Tuple[str, Dict]]:
+    """Worker task: _scan_file() for each file of a chunk, in order"""
+    return [_scan_file(project_path, filepath, scans, known_sha1) for filepath, scans, known_sha1 in chunk]
+
+
+def default_jobs() -> int:
+    """--jobs default: the number of CPU cores"""
+    return os.cpu_count() or 1
+
+
+def load_project_files(project_path: str, scans: List[str] = FILE_SCANS, jobs: int = 1,
+                       cache: ScanCache = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Walk project_path once and read each candidate file once, handing its
+    content to every one of `scans` that wants it (rather than one walk and
+    one read per scan).
+    jobs > 1 shards the files, MIN_CHUNK_FILES to CHUNK_FILES at a time,
+    across that many worker processes (once there are at least two chunks);
+    results are merged back in walk order, so the output is the same for any jobs.
+    cache: ScanCache answering for unchanged files; only the rest are read.
+    Returns {scan: {"findings": [...], "scanned_files": n}}, findings in walk order.
+    """
+    loaded = {scan: {"findings": [], "scanned_files": 0} for scan in scans}
+    per_file = []
+    pending = []  # (index in per_file, relpath, stat) of files that have to be read
+    tasks = []
+    
+    for filepath, wanted in iter_project_files(project_path, scans):
+        for scan in wanted:
+            loaded[scan]["scanned_files"] += 1
+        
+        found = stat = None
+        relpath = str(filepath.relative_to(project_path))
+        if cache is not None:
+            try:
+                stat = filepath.stat()
+                found = cache.lookup(relpath, stat, wanted)
+            except OSError:
+                pass
+        if found is None:
+            pending.append((len(per_file), relpath, stat))
+            tasks.append((filepath, wanted, cache.digest(relpath, wanted) if stat is not None else None))
+        per_file.append(found)
+    
+    # Chunks of at least MIN_CHUNK_FILES: below that, pool start-up costs more than it saves
+    size = max(MIN_CHUNK_FILES, min(CHUNK_FILES, len(tasks) // (max(jobs, 1) * CHUNKS_PER_JOB)))
+    chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+    
+    if jobs > 1 and len(chunks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+            # map() yields in submission order: the merge below is deterministic
+            results = executor.map(_scan_chunk, [project_path] * len(chunks), chunks)
+            scanned = [result for chunk in results for result in chunk]
+    else:
+        scanned = [_scan_file(project_path, *task) for task in tasks]
+    
+    for (index, relpath, stat), (filepath, wanted, _), (sha1, found) in zip(pending, tasks, scanned):
+        if found is None:
+            found = cache.reuse(relpath, stat, wanted)
+        elif stat is not None:
+            cache.store(relpath, stat, sha1, found)
+        elif cache is not None:
+            cache.misses += 1
+        per_file[index] = found
+    
+    for found in per_file:
+        for scan, findings in found.items():
+            loaded[scan]["findings"].extend(findings)
+    
+    return loaded
 
 
 # ============================================================================
@@ -178,47 +584,25 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+def scan_secrets(project_path: str, loaded: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
+    loaded: load_project_files() output to reuse instead of walking the tree again.
     """
+    if loaded is None:
+        loaded = load_project_files(project_path, ["secrets"])
+    
     results = {
         "tool": "secret_scanner",
-        "findings": [],
+        "findings": loaded["secrets"]["findings"],
         "status": "[OK] No secrets detected",
-        "scanned_files": 0,
+        "scanned_files": loaded["secrets"]["scanned_files"],
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+    for finding in results["findings"]:
+        results["by_severity"][finding["severity"]] += finding["count"]
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -233,49 +617,25 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, loaded: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
+    loaded: load_project_files() output to reuse instead of walking the tree again.
     """
+    if loaded is None:
+        loaded = load_project_files(project_path, ["patterns"])
+    
     results = {
         "tool": "pattern_scanner",
-        "findings": [],
+        "findings": loaded["patterns"]["findings"],
         "status": "[OK] No dangerous patterns",
-        "scanned_files": 0,
+        "scanned_files": loaded["patterns"]["scanned_files"],
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+    for finding in results["findings"]:
+        results["by_category"][finding["category"]] = results["by_category"].get(finding["category"], 0) + 1
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -293,53 +653,22 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+def scan_configuration(project_path: str, loaded: Dict[str, Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
+    loaded: load_project_files() output to reuse instead of walking the tree again.
     """
+    if loaded is None:
+        loaded = load_project_files(project_path, ["config"])
+    
     results = {
         "tool": "config_scanner",
-        "findings": [],
+        "findings": list(loaded["config"]["findings"]),
         "status": "[OK] Configuration secure",
         "checks": {}
     }
     
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
-    
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
     for hf in header_files:
@@ -369,8 +698,12 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
-    """Execute security validation scans."""
+def run_full_scan(project_path: str, scan_type: str = "all", jobs: int = 1, use_cache: bool = False) -> Dict[str, Any]:
+    """
+    Execute security validation scans (file contents scanned by `jobs` processes).
+    use_cache: reuse per-file findings from CACHE_FILE under the project for unchanged files.
+    """
+    started = time.perf_counter()
     
     report = {
         "project": project_path,
@@ -392,9 +725,16 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         "config": ("configuration", scan_configuration),
     }
     
+    # One walk and one read per file, shared by every content scan that runs
+    content_scans = [key for key in FILE_SCANS if scan_type == "all" or scan_type == key]
+    cache = ScanCache(Path(project_path) / CACHE_FILE) if use_cache and content_scans else None
+    loaded = load_project_files(project_path, content_scans, jobs, cache) if content_scans else None
+    if cache is not None:
+        cache.save(prune=len(content_scans) == len(FILE_SCANS))
+    
     for key, (name, scanner) in scanners.items():
         if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
+            result = scanner(project_path, loaded) if key in FILE_SCANS else scanner(project_path)
             report["scans"][name] = result
             
             findings_count = len(result.get("findings", []))
@@ -415,6 +755,12 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
     elif report["summary"]["total_findings"] > 0:
         report["summary"]["overall_status"] = "[?] REVIEW RECOMMENDED"
     
+    report["performance"] = {
+        "wall_time": round(time.perf_counter() - started, 3),
+        "jobs": jobs,
+        "cache": cache.stats() if cache is not None else None
+    }
+    
     return report
 
 
@@ -427,14 +773,21 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    parser.add_argument("--jobs", "-j", type=int, default=default_jobs(),
+                        help="Worker processes for file scanning (default: number of CPU cores)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Rescan every file instead of reusing findings from <project>/{CACHE_FILE.as_posix()}")
     
     args = parser.parse_args()
     
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
     if not os.path.isdir(args.project_path):
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    result = run_full_scan(args.project_path, args.scan_type, args.jobs, use_cache=not args.no_cache)
     
     if args.output == "summary":
         print(f"\n{'='*60}")
@@ -444,6 +797,10 @@ def main():
         print(f"Total Findings: {result['summary']['total_findings']}")
         print(f"  Critical: {result['summary']['critical']}")
         print(f"  High: {result['summary']['high']}")
+        cache = result['performance']['cache']
+        if cache:
+            print(f"Cache: {cache['hits']}/{cache['hits'] + cache['misses']} files ({cache['hit_rate']:.0%})")
+        print(f"Wall time: {result['performance']['wall_time']:.2f}s")
         print(f"{'='*60}\n")
         
         for scan_name, scan_result in result['scans'].items():